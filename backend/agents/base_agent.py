@@ -1,9 +1,70 @@
 import google.generativeai as genai
+from google.generativeai import caching
+from google import genai as genai_sdk
+from google.api_core.exceptions import DeadlineExceeded
 from config import config
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from utils.logger import RunLogger
+import asyncio
+import datetime
+import functools
+import hashlib
+import os
+import random
 import time
 
+# Configure Gemini once per process
+genai.configure(api_key=config.GOOGLE_API_KEY)
+
+# Heading that introduces the complaint in every prompt that carries it
+COMPLAINT_HEADER = "ORIGINAL COMPLAINT:\n"
+
+# Prompt file contents keyed by path, with the mtime they were read at
+_PROMPT_CACHE: Dict[str, Tuple[float, str]] = {}
+
+# Batch job states that will not change any further
+BATCH_TERMINAL_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count for text, without a count_tokens round trip."""
+    return len(text) // config.CHARS_PER_TOKEN
+
+def read_prompt(prompt_path: str) -> str:
+    """Read a prompt file, reusing the cached copy if unchanged."""
+    try:
+        mtime = os.stat(prompt_path).st_mtime
+        cached = _PROMPT_CACHE.get(prompt_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        with open(prompt_path, 'r') as f:
+            content = f.read()
+        _PROMPT_CACHE[prompt_path] = (mtime, content)
+        return content
+    except Exception as e:
+        raise Exception(f"Error loading prompt from {prompt_path}: {str(e)}")
+
+@functools.lru_cache(maxsize=8)
+def _get_model(model_name: str, temperature: float, max_tokens: int) -> genai.GenerativeModel:
+    """Return a shared Gemini model for the given generation settings."""
+    return genai.GenerativeModel(
+        model_name=model_name,
+        generation_config={
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+        }
+    )
+
+@functools.lru_cache(maxsize=1)
+def _get_batch_client() -> genai_sdk.Client:
+    """Return a shared client for the Gemini Batch API."""
+    return genai_sdk.Client(api_key=config.GOOGLE_API_KEY)
+
 class BaseAgent:
     """Base class for all agents using Google Gemini."""
     
@@ -19,28 +80,99 @@ class BaseAgent:
         self.agent_name = agent_name
         self.system_prompt = self._load_prompt()
         self.logger: Optional[RunLogger] = None
+        self.batch_mode = False
+        
+        # Responses for this agent's lifetime, keyed by a hash of the full request
+        self._response_cache: Dict[str, str] = {}
+        
+        # Explicit Gemini context cache holding the system prompt and complaint
+        self._context_cache: Optional[caching.CachedContent] = None
+        self._cached_model: Optional[genai.GenerativeModel] = None
+        self._cached_complaint: Optional[str] = None
+        self._cache_requested_for: Optional[str] = None
+        
+        # Shared across agents; building a model per request is wasted work
+        self.model = _get_model(config.MODEL_NAME, config.TEMPERATURE, config.MAX_TOKENS)
+    
+    def set_logger(self, logger: RunLogger):
+        """Set the logger for this agent."""
+        self.logger = logger
+    
+    def create_context_cache(self, complaint_text: str):
+        """
+        Cache the system prompt and complaint text on Gemini's side.
+        
+        Subsequent calls for the same complaint only send the iteration-specific
+        suffix. Failures (e.g. content below the model's minimum cache size) are
+        logged and the agent keeps sending full prompts.
+        
+        Args:
+            complaint_text: Full text of the legal complaint
+        """
+        self.clear_context_cache()
+        self._cache_requested_for = complaint_text
+        try:
+            self._context_cache = caching.CachedContent.create(
+                model=config.MODEL_NAME,
+                display_name=f"{self.agent_name.lower()}-context",
+                system_instruction=self.system_prompt,
+                contents=[self._complaint_block(complaint_text)],
+                ttl=datetime.timedelta(seconds=config.CONTEXT_CACHE_TTL),
+            )
+        except Exception as e:
+            self._log("warning", f"[{self.agent_name}] Context cache unavailable, sending full prompts: {str(e)}")
+            return
         
-        # Configure Gemini
-        genai.configure(api_key=config.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel(
-            model_name=config.MODEL_NAME,
+        self._cached_model = genai.GenerativeModel.from_cached_content(
+            self._context_cache,
             generation_config={
                 "temperature": config.TEMPERATURE,
                 "max_output_tokens": config.MAX_TOKENS,
             }
         )
+        self._cached_complaint = complaint_text
+        self._log("debug", f"[{self.agent_name}] Created context cache {self._context_cache.name}")
     
-    def set_logger(self, logger: RunLogger):
-        """Set the logger for this agent."""
-        self.logger = logger
+    def ensure_context_cache(self, complaint_text: str):
+        """Create the context cache for complaint_text unless already attempted."""
+        if self._cache_requested_for is complaint_text:
+            return
+        self.create_context_cache(complaint_text)
+    
+    def clear_context_cache(self):
+        """Delete the context cache, if any, and fall back to full prompts."""
+        if self._context_cache:
+            try:
+                self._context_cache.delete()
+            except Exception as e:
+                self._log("warning", f"[{self.agent_name}] Failed to delete context cache: {str(e)}")
+        self._context_cache = None
+        self._cached_model = None
+        self._cached_complaint = None
+        self._cache_requested_for = None
+    
+    def _complaint_block(self, complaint_text: str) -> str:
+        """Format the complaint as the stable prompt prefix."""
+        return COMPLAINT_HEADER + complaint_text
+    
+    def _with_complaint(self, complaint_text: str, body: str) -> str:
+        """Prefix body with the complaint unless it is already in the context cache."""
+        if self._cached_complaint is not None and self._cached_complaint == complaint_text:
+            return body
+        # One join copies the (possibly multi-MB) complaint once
+        return "".join((COMPLAINT_HEADER, complaint_text, "\n\n", body))
+    
+    def _active_model(self) -> genai.GenerativeModel:
+        """Return the context-cached model if one is active."""
+        return self._cached_model or self.model
     
     def _load_prompt(self) -> str:
         """Load the system prompt from file."""
-        try:
-            with open(self.prompt_path, 'r') as f:
-                return f.read()
-        except Exception as e:
-            raise Exception(f"Error loading prompt from {self.prompt_path}: {str(e)}")
+        return read_prompt(self.prompt_path)
+    
+    def refresh_prompt(self):
+        """Re-read the system prompt, picking up edits made since the agent was built."""
+        self.system_prompt = self._load_prompt()
     
     def _log(self, level: str, message: str):
         """Log a message if logger is available."""
@@ -54,66 +186,374 @@ class BaseAgent:
             elif level == "error":
                 self.logger.log_error(message)
     
-    def generate_response(self, user_input: str, iteration: int = 1) -> str:
+    def generate_response(self, user_input: str, iteration: int = 1, on_token: Optional[Callable[[str], None]] = None,
+                          stop_when: Optional[Callable[[str], bool]] = None) -> str:
         """
         Generate a response using Gemini.
         
         Args:
             user_input: The user's input text
             iteration: Current iteration number for logging
+            on_token: Optional callback receiving text chunks as they stream in
+            stop_when: Optional predicate over each streamed chunk; generation
+                stops as soon as it returns True
             
         Returns:
             Generated response as string
         """
+        # Identical input (e.g. the Fixer returned an unchanged chart) - reuse the answer
+        key = self._response_key(user_input)
+        cached = self._reuse_response(key, iteration)
+        if cached is not None:
+            if on_token:
+                on_token(cached)
+            return cached
+        
+        if self.batch_mode:
+            text = self.generate_response_batch([user_input], iteration)[0]
+            if isinstance(text, Exception):
+                raise text
+        elif on_token or stop_when:
+            text = self.generate_response_stream(user_input, on_token, iteration, stop_when)
+        else:
+            text = self._generate_once(user_input, iteration)
+        
+        self._response_cache[key] = text
+        return text
+    
+    def _generate_once(self, user_input: str, iteration: int) -> str:
+        """Make a single (non-streaming) Gemini request."""
         start_time = time.time()
         
         try:
-            # Log agent start
-            if self.logger:
-                self.logger.log_agent_start(self.agent_name, iteration)
-                self.logger.log_agent_input(self.agent_name, user_input)
+            full_prompt = self._prepare_request(user_input, iteration)
+            
+            # Generate response
+            response = self._call_model(full_prompt)
+            
+            return self._handle_response(response, start_time)
             
-            # Combine system prompt and user input
-            full_prompt = f"{self.system_prompt}\n\n{user_input}"
+        except Exception as e:
+            self._handle_error(e, start_time)
+    
+    def generate_response_stream(self, user_input: str, on_token: Optional[Callable[[str], None]] = None, iteration: int = 1,
+                                 stop_when: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Generate a response using Gemini, streaming text chunks as they arrive.
+        
+        Args:
+            user_input: The user's input text
+            on_token: Optional callback receiving each text chunk
+            iteration: Current iteration number for logging
+            stop_when: Optional predicate over each chunk; when it returns True
+                the stream is abandoned and the text so far is returned
+            
+        Returns:
+            Generated response as string
+        """
+        start_time = time.time()
+        
+        try:
+            full_prompt = self._prepare_request(user_input, iteration)
+            
+            return self._call_model_stream(full_prompt, on_token, stop_when, start_time)
+            
+        except Exception as e:
+            self._handle_error(e, start_time)
+    
+    async def agenerate_response(self, user_input: str, iteration: int = 1, on_token: Optional[Callable[[str], None]] = None,
+                                 stop_when: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Generate a response using Gemini without blocking the event loop.
+        
+        Args:
+            user_input: The user's input text
+            iteration: Current iteration number for logging
+            on_token: Optional callback receiving text chunks as they stream in
+            stop_when: Optional predicate over each streamed chunk; generation
+                stops as soon as it returns True
             
-            self._log("debug", f"[{self.agent_name}] Sending request to Gemini...")
+        Returns:
+            Generated response as string
+        """
+        key = self._response_key(user_input)
+        cached = self._reuse_response(key, iteration)
+        if cached is not None:
+            if on_token:
+                on_token(cached)
+            return cached
+        
+        start_time = time.time()
+        
+        try:
+            full_prompt = self._prepare_request(user_input, iteration)
             
             # Generate response
-            response = self.model.generate_content(full_prompt)
+            if on_token or stop_when:
+                text = await self._acall_model_stream(full_prompt, on_token, stop_when, start_time)
+            else:
+                text = self._handle_response(await self._acall_model(full_prompt), start_time)
+            
+        except Exception as e:
+            self._handle_error(e, start_time)
+        
+        self._response_cache[key] = text
+        return text
+    
+    def _response_key(self, user_input: str) -> str:
+        """Hash everything that determines a response: model settings, prompt and input."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{config.MODEL_NAME}|{config.TEMPERATURE}|{config.MAX_TOKENS}\n".encode())
+        digest.update(self.system_prompt.encode())
+        digest.update(b"\0")
+        digest.update(user_input.encode())
+        return digest.hexdigest()
+    
+    def _reuse_response(self, key: str, iteration: int) -> Optional[str]:
+        """Return a previously generated response for key, logging the reuse."""
+        text = self._response_cache.get(key)
+        if text is not None and self.logger:
+            self.logger.log_agent_start(self.agent_name, iteration)
+            self.logger.log_info(f"[{self.agent_name}] Input unchanged - reusing previous response")
+        return text
+    
+    def generate_response_batch(self, inputs: List[str], iteration: int = 1) -> List[Union[str, Exception]]:
+        """
+        Generate responses through the Gemini Batch API.
+        
+        Batch jobs are billed at a discount but may take minutes to complete,
+        so this is only suitable for non-interactive runs. Blocks while polling.
+        
+        Args:
+            inputs: User inputs, one per request
+            iteration: Current iteration number for logging
+            
+        Returns:
+            Generated responses in the same order as inputs, or the error for
+            each request that failed or was blocked. Raises only if the job
+            itself fails.
+        """
+        start_time = time.time()
+        
+        try:
+            requests = [
+                {
+                    "contents": [{"role": "user", "parts": [{"text": self._prepare_request(user_input, iteration)}]}],
+                    "config": {
+                        "temperature": config.TEMPERATURE,
+                        "max_output_tokens": config.MAX_TOKENS,
+                    },
+                }
+                for user_input in inputs
+            ]
             
-            duration = time.time() - start_time
+            client = _get_batch_client()
+            job = client.batches.create(
+                model=config.MODEL_NAME,
+                src=requests,
+                config={"display_name": f"{self.agent_name.lower()}-iteration-{iteration}"},
+            )
+            self._log("info", f"[{self.agent_name}] Submitted batch job {job.name} with {len(requests)} request(s)")
             
-            # Check if response has valid parts
-            if not response.parts:
-                # Log the finish reason for debugging
-                finish_reason = response.candidates[0].finish_reason if response.candidates else "UNKNOWN"
-                safety_ratings = response.candidates[0].safety_ratings if response.candidates else []
-                
-                error_details = f"Response blocked. Finish reason: {finish_reason}"
-                if safety_ratings:
-                    error_details += f"\nSafety ratings: {safety_ratings}"
-                
-                self._log("error", f"[{self.agent_name}] {error_details}")
-                
-                # Try to get any available text from prompt_feedback
-                if hasattr(response, 'prompt_feedback'):
-                    error_details += f"\nPrompt feedback: {response.prompt_feedback}"
+            # Poll until the job settles
+            while job.state.name not in BATCH_TERMINAL_STATES:
+                time.sleep(config.BATCH_POLL_INTERVAL)
+                job = client.batches.get(name=job.name)
+            
+            if job.state.name != "JOB_STATE_SUCCEEDED":
+                raise Exception(f"Batch job {job.name} ended with state {job.state.name}: {job.error}")
+            
+            results: List[Union[str, Exception]] = []
+            for index, inlined in enumerate(job.dest.inlined_responses):
+                # One failed request shouldn't sink the others in the job
+                if inlined.error:
+                    error = Exception(f"Batch request {index} failed: {inlined.error}")
+                elif not inlined.response or not inlined.response.text:
+                    error = Exception(f"Gemini response blocked or empty for batch request {index}")
+                else:
+                    results.append(inlined.response.text)
+                    if self.logger:
+                        self.logger.log_agent_output(self.agent_name, inlined.response.text)
+                    continue
                 
-                raise Exception(f"Gemini response blocked or empty. {error_details}")
+                if self.logger:
+                    self.logger.log_agent_error(self.agent_name, str(error))
+                results.append(error)
             
-            # Log output
             if self.logger:
-                self.logger.log_agent_output(self.agent_name, response.text)
-                self.logger.log_agent_complete(self.agent_name, duration)
+                self.logger.log_agent_complete(self.agent_name, time.time() - start_time)
             
-            return response.text
+            return results
             
         except Exception as e:
-            duration = time.time() - start_time
-            error_msg = f"Error generating response: {str(e)}"
+            self._handle_error(e, start_time)
+    
+    def _call_model(self, full_prompt: str):
+        """Call Gemini with a per-attempt timeout, retrying timeouts with backoff."""
+        for attempt in range(1, config.REQUEST_MAX_ATTEMPTS + 1):
+            try:
+                return self._active_model().generate_content(
+                    full_prompt,
+                    request_options={"timeout": config.REQUEST_TIMEOUT}
+                )
+            except DeadlineExceeded:
+                self._on_timeout(attempt)
+                time.sleep(self._backoff_delay(attempt))
+    
+    async def _acall_model(self, full_prompt: str):
+        """Async variant of _call_model."""
+        for attempt in range(1, config.REQUEST_MAX_ATTEMPTS + 1):
+            try:
+                return await asyncio.wait_for(
+                    self._active_model().generate_content_async(full_prompt),
+                    timeout=config.REQUEST_TIMEOUT
+                )
+            except (asyncio.TimeoutError, DeadlineExceeded):
+                self._on_timeout(attempt)
+                await asyncio.sleep(self._backoff_delay(attempt))
+    
+    def _call_model_stream(self, full_prompt: str, on_token: Optional[Callable[[str], None]],
+                           stop_when: Optional[Callable[[str], bool]], start_time: float) -> str:
+        """
+        Stream a Gemini response with the same timeout retries as _call_model.
+        
+        A timed-out attempt is restarted from the beginning, so on_token may
+        see the opening chunks again.
+        """
+        for attempt in range(1, config.REQUEST_MAX_ATTEMPTS + 1):
+            try:
+                response = self._active_model().generate_content(
+                    full_prompt,
+                    stream=True,
+                    request_options={"timeout": config.REQUEST_TIMEOUT}
+                )
+                streamed = []
+                for chunk in response:
+                    if not chunk.parts:
+                        continue
+                    text = chunk.text
+                    if on_token:
+                        on_token(text)
+                    streamed.append(text)
+                    if stop_when and stop_when(text):
+                        return self._finish_early(response, "".join(streamed), start_time)
+                
+                # The iterated response aggregates all chunks
+                return self._handle_response(response, start_time)
+            except DeadlineExceeded:
+                self._on_timeout(attempt)
+                time.sleep(self._backoff_delay(attempt))
+    
+    async def _acall_model_stream(self, full_prompt: str, on_token: Optional[Callable[[str], None]],
+                                  stop_when: Optional[Callable[[str], bool]], start_time: float) -> str:
+        """Async variant of _call_model_stream."""
+        for attempt in range(1, config.REQUEST_MAX_ATTEMPTS + 1):
+            try:
+                return await asyncio.wait_for(
+                    self._astream_once(full_prompt, on_token, stop_when, start_time),
+                    timeout=config.REQUEST_TIMEOUT
+                )
+            except (asyncio.TimeoutError, DeadlineExceeded):
+                self._on_timeout(attempt)
+                await asyncio.sleep(self._backoff_delay(attempt))
+    
+    async def _astream_once(self, full_prompt: str, on_token: Optional[Callable[[str], None]],
+                            stop_when: Optional[Callable[[str], bool]], start_time: float) -> str:
+        """Make a single streaming Gemini request and return its text."""
+        response = await self._active_model().generate_content_async(full_prompt, stream=True)
+        streamed = []
+        async for chunk in response:
+            if not chunk.parts:
+                continue
+            chunk_text = chunk.text
+            if on_token:
+                on_token(chunk_text)
+            streamed.append(chunk_text)
+            if stop_when and stop_when(chunk_text):
+                return self._finish_early(response, "".join(streamed), start_time)
+        return self._handle_response(response, start_time)
+    
+    def _on_timeout(self, attempt: int):
+        """Log a timed-out attempt, raising once attempts are exhausted."""
+        if attempt >= config.REQUEST_MAX_ATTEMPTS:
+            raise Exception(f"Gemini request timed out after {attempt} attempts of {config.REQUEST_TIMEOUT:.0f}s")
+        self._log("warning", f"[{self.agent_name}] Request timed out (attempt {attempt}/{config.REQUEST_MAX_ATTEMPTS}), retrying...")
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter between retries."""
+        return config.RETRY_BACKOFF_BASE * (2 ** (attempt - 1)) + random.uniform(0, config.RETRY_BACKOFF_BASE)
+    
+    def _prepare_request(self, user_input: str, iteration: int) -> str:
+        """Log the agent start and build the full prompt."""
+        # Log agent start
+        if self.logger:
+            self.logger.log_agent_start(self.agent_name, iteration)
+            self.logger.log_agent_input(self.agent_name, user_input)
+        
+        # Combine system prompt and user input; a context cache already holds the prompt
+        if self._context_cache:
+            full_prompt = user_input
+        else:
+            full_prompt = "\n\n".join((self.system_prompt, user_input))
+        
+        self._log("debug", f"[{self.agent_name}] Sending request to Gemini...")
+        return full_prompt
+    
+    def _handle_response(self, response, start_time: float) -> str:
+        """Validate a Gemini response, log it and return its text."""
+        duration = time.time() - start_time
+        
+        # Check if response has valid parts; diagnostics are only gathered on failure
+        parts = response.parts
+        if not parts:
+            # Log the finish reason for debugging
+            candidates = response.candidates
+            candidate = candidates[0] if candidates else None
+            finish_reason = candidate.finish_reason if candidate else "UNKNOWN"
+            safety_ratings = candidate.safety_ratings if candidate else []
             
-            if self.logger:
-                self.logger.log_agent_error(self.agent_name, error_msg)
-                self.logger.log_agent_complete(self.agent_name, duration)
+            error_details = f"Response blocked. Finish reason: {finish_reason}"
+            if safety_ratings:
+                error_details += f"\nSafety ratings: {safety_ratings}"
+            
+            self._log("error", f"[{self.agent_name}] {error_details}")
             
-            raise Exception(error_msg)
\ No newline at end of file
+            # Try to get any available text from prompt_feedback
+            if hasattr(response, 'prompt_feedback'):
+                error_details += f"\nPrompt feedback: {response.prompt_feedback}"
+            
+            raise Exception(f"Gemini response blocked or empty. {error_details}")
+        
+        text = response.text
+        
+        # Log output
+        if self.logger:
+            self.logger.log_agent_output(self.agent_name, text)
+            self.logger.log_agent_complete(self.agent_name, duration)
+        
+        return text
+    
+    def _finish_early(self, response, text: str, start_time: float) -> str:
+        """Abandon a stream once the caller has what it needs and log the partial text."""
+        # Best effort: the SDK exposes no close(), but the underlying gRPC call can be cancelled
+        cancel = getattr(getattr(response, "_iterator", None), "cancel", None)
+        if cancel:
+            cancel()
+        
+        if self.logger:
+            self.logger.log_info(f"[{self.agent_name}] Stopped generation early")
+            self.logger.log_agent_output(self.agent_name, text)
+            self.logger.log_agent_complete(self.agent_name, time.time() - start_time)
+        
+        return text
+    
+    def _handle_error(self, error: Exception, start_time: float):
+        """Log a failed request and re-raise it with context."""
+        duration = time.time() - start_time
+        error_msg = f"Error generating response: {str(error)}"
+        
+        if self.logger:
+            self.logger.log_agent_error(self.agent_name, error_msg)
+            self.logger.log_agent_complete(self.agent_name, duration)
+        
+        raise Exception(error_msg)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from agents.base_agent import BaseAgent
 from config import config
+from typing import Callable, List, Optional, Union
 
 class FixerAgent(BaseAgent):
     """Agent 3: Reflection/Fix Agent
@@ -7,10 +8,17 @@ class FixerAgent(BaseAgent):
     Fixes issues in the falsity chart based on reviewer feedback.
     """
     
+    # Request body following the complaint
+    _TEMPLATE = (
+        "DRAFT FALSITY CHART:\n{chart}\n\n"
+        "AUDIT REPORT (ISSUES TO FIX):\n{issues}\n\n"
+        "Please fix the draft falsity chart above based on the audit report and generate the final, corrected falsity chart."
+    )
+    
     def __init__(self):
         super().__init__(config.FIXER_PROMPT_PATH, agent_name="Fixer")
     
-    def fix_chart(self, complaint_text: str, chart: str, issues: str, iteration: int = 1) -> str:
+    def fix_chart(self, complaint_text: str, chart: str, issues: str, iteration: int = 1, on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Fix the falsity chart based on identified issues.
         
@@ -19,21 +27,36 @@ class FixerAgent(BaseAgent):
             chart: Current falsity chart with issues
             issues: List of issues from the reviewer
             iteration: Current iteration number for logging
+            on_token: Optional callback receiving text chunks as they stream in
             
         Returns:
             Corrected falsity chart
         """
-        user_input = f"""Please fix the following falsity chart based on the audit report.
-
-ORIGINAL COMPLAINT:
-{complaint_text}
-
-DRAFT FALSITY CHART:
-{chart}
-
-AUDIT REPORT (ISSUES TO FIX):
-{issues}
-
-Please generate the final, corrected falsity chart."""
+        return self.generate_response(self._build_input(complaint_text, chart, issues), iteration, on_token)
+    
+    async def afix_chart(self, complaint_text: str, chart: str, issues: str, iteration: int = 1, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Async variant of fix_chart."""
+        return await self.agenerate_response(self._build_input(complaint_text, chart, issues), iteration, on_token)
+    
+    def fix_charts_batch(self, complaint_texts: List[str], charts: List[str], issues: List[str], iteration: int = 1) -> List[Union[str, Exception]]:
+        """
+        Fix several charts in one Gemini Batch API job.
         
-        return self.generate_response(user_input, iteration)
\ No newline at end of file
+        Args:
+            complaint_texts: Original complaint text for each chart
+            charts: Current falsity chart for each complaint
+            issues: Reviewer findings for each chart
+            iteration: Current iteration number for logging
+            
+        Returns:
+            Corrected falsity chart for each complaint, in order, or the
+            error for each request that failed
+        """
+        return self.generate_response_batch([
+            self._build_input(complaint_text, chart, chart_issues)
+            for complaint_text, chart, chart_issues in zip(complaint_texts, charts, issues)
+        ], iteration)
+    
+    def _build_input(self, complaint_text: str, chart: str, issues: str) -> str:
+        """Build the user input for the fixer, with the stable complaint first."""
+        return self._with_complaint(complaint_text, self._TEMPLATE.format_map({"chart": chart, "issues": issues}))
\ No newline at end of file
@@ -0,0 +1,95 @@
+from agents.base_agent import BaseAgent, read_prompt
+from config import config
+from typing import Dict, Optional
+import google.generativeai as genai
+import functools
+import json
+
+# Structured response the fused prompt asks for
+FUSED_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "chart": {"type": "string"},
+        "issues": {"type": "string"},
+        "revised_chart": {"type": "string"},
+        "approved": {"type": "boolean"},
+    },
+    "required": ["chart", "issues", "revised_chart", "approved"],
+}
+
+@functools.lru_cache(maxsize=4)
+def _get_fused_model(model_name: str, temperature: float, max_tokens: int) -> genai.GenerativeModel:
+    """Return a shared JSON-mode Gemini model constrained to FUSED_RESPONSE_SCHEMA."""
+    return genai.GenerativeModel(
+        model_name=model_name,
+        generation_config={
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+            "response_mime_type": "application/json",
+            "response_schema": FUSED_RESPONSE_SCHEMA,
+        }
+    )
+
+class FusedResponseError(Exception):
+    """Raised when a fused response does not match FUSED_RESPONSE_SCHEMA."""
+
+class FusedAgent(BaseAgent):
+    """Fused Generate/Review/Fix Agent
+    
+    Drafts, audits and revises the falsity chart in a single Gemini call,
+    returning all three results as JSON.
+    """
+    
+    _TEMPLATE = "Please analyze the following complaint, then draft, audit and revise its falsity chart."
+    
+    def __init__(self):
+        super().__init__(config.FUSED_PROMPT_PATH, agent_name="Fused")
+        self.model = _get_fused_model(config.MODEL_NAME, config.TEMPERATURE, config.MAX_TOKENS)
+    
+    def run(self, complaint_text: str, chart: Optional[str] = None, issues: Optional[str] = None, iteration: int = 1) -> Dict:
+        """
+        Draft (or take over), audit and revise a falsity chart in one call.
+        
+        Args:
+            complaint_text: Full text of the legal complaint
+            chart: Chart revised by the previous iteration, if any
+            issues: Audit findings that chart was revised from
+            iteration: Current iteration number for logging
+            
+        Returns:
+            Dictionary with chart, issues, revised_chart and approved
+        """
+        return self._parse(self.generate_response(self._build_input(complaint_text, chart, issues), iteration))
+    
+    async def arun(self, complaint_text: str, chart: Optional[str] = None, issues: Optional[str] = None, iteration: int = 1) -> Dict:
+        """Async variant of run."""
+        return self._parse(await self.agenerate_response(self._build_input(complaint_text, chart, issues), iteration))
+    
+    def _load_prompt(self) -> str:
+        """Load the system prompt: the Generator's prompt followed by the fused prompt."""
+        # Extraction rules come from the Generator's prompt; the fused prompt
+        # adds the audit and revision steps
+        return "\n\n".join((read_prompt(config.GENERATOR_PROMPT_PATH), read_prompt(self.prompt_path)))
+    
+    def _parse(self, response: str) -> Dict:
+        """Decode and check a fused response."""
+        try:
+            result = json.loads(response)
+        except ValueError as e:
+            raise FusedResponseError(f"Response is not valid JSON: {str(e)}")
+        
+        if not isinstance(result, dict):
+            raise FusedResponseError("Response is not a JSON object")
+        for field, field_schema in FUSED_RESPONSE_SCHEMA["properties"].items():
+            expected = bool if field_schema["type"] == "boolean" else str
+            if not isinstance(result.get(field), expected):
+                raise FusedResponseError(f"Response field '{field}' is missing or not a {field_schema['type']}")
+        return result
+    
+    def _build_input(self, complaint_text: str, chart: Optional[str], issues: Optional[str]) -> str:
+        """Build the user input, carrying over the previous iteration's chart if any."""
+        parts = [self._TEMPLATE, self._complaint_block(complaint_text)]
+        if chart is not None:
+            parts.append(f"CURRENT FALSITY CHART:\n{chart}")
+            parts.append(f"PREVIOUS AUDIT REPORT (ALREADY ADDRESSED):\n{issues}")
+        return "\n\n".join(parts)
\ No newline at end of file
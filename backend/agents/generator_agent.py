@@ -1,5 +1,7 @@
 from agents.base_agent import BaseAgent
 from config import config
+from utils.sections import MissingBlocksError, split_sections, build_sectioned_input, parse_tagged_blocks, merge_markdown_tables
+from typing import Callable, List, Optional, Union
 
 class GeneratorAgent(BaseAgent):
     """Agent 1: Falsity Chart Generator
@@ -7,19 +9,125 @@ class GeneratorAgent(BaseAgent):
     Generates the initial falsity chart from complaint text.
     """
     
+    _TEMPLATE = "Please analyze the following complaint and generate a falsity chart:\n\n{complaint}"
+    
     def __init__(self):
         super().__init__(config.GENERATOR_PROMPT_PATH, agent_name="Generator")
     
-    def generate_chart(self, complaint_text: str, iteration: int = 1) -> str:
+    def generate_chart(self, complaint_text: str, iteration: int = 1, on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate a falsity chart from the complaint text.
         
+        Long complaints are split into sections that are charted in a single
+        request and merged back into one table. If the response leaves out a
+        section's chart, the complaint is charted whole instead.
+        
         Args:
             complaint_text: Full text of the legal complaint
             iteration: Current iteration number for logging
+            on_token: Optional callback receiving text chunks as they stream in
             
         Returns:
             Markdown formatted falsity chart
         """
-        user_input = f"Please analyze the following complaint and generate a falsity chart:\n\n{complaint_text}"
-        return self.generate_response(user_input, iteration)
\ No newline at end of file
+        sections = self._split(complaint_text)
+        if len(sections) > 1:
+            try:
+                return merge_markdown_tables(self.generate_section_charts(sections, iteration, on_token))
+            except MissingBlocksError as e:
+                self._log_whole_fallback(e)
+        return self.generate_response(self._build_input(complaint_text), iteration, on_token)
+    
+    async def agenerate_chart(self, complaint_text: str, iteration: int = 1, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Async variant of generate_chart."""
+        sections = self._split(complaint_text)
+        if len(sections) > 1:
+            try:
+                return merge_markdown_tables(await self.agenerate_section_charts(sections, iteration, on_token))
+            except MissingBlocksError as e:
+                self._log_whole_fallback(e)
+        return await self.agenerate_response(self._build_input(complaint_text), iteration, on_token)
+    
+    def generate_charts_batch(self, complaint_texts: List[str], iteration: int = 1) -> List[Union[str, Exception]]:
+        """
+        Generate falsity charts for several complaints in one Gemini Batch API job.
+        
+        Args:
+            complaint_texts: Full text of each legal complaint
+            iteration: Current iteration number for logging
+            
+        Returns:
+            Markdown formatted falsity chart for each complaint, in order, or
+            the error for each complaint whose request failed
+        """
+        splits = [self._split(complaint_text) for complaint_text in complaint_texts]
+        responses = self.generate_response_batch([
+            self._build_sectioned_input(sections) if len(sections) > 1 else self._build_input(complaint_text)
+            for complaint_text, sections in zip(complaint_texts, splits)
+        ], iteration)
+        
+        charts = []
+        retry = []
+        for index, (response, sections) in enumerate(zip(responses, splits)):
+            if len(sections) == 1 or isinstance(response, Exception):
+                charts.append(response)
+                continue
+            try:
+                charts.append(merge_markdown_tables(parse_tagged_blocks(response, "CHART", len(sections))))
+            except MissingBlocksError as e:
+                self._log_whole_fallback(e)
+                charts.append(None)
+                retry.append(index)
+        
+        # Chart the complaints whose sectioned response was incomplete whole, in one more job
+        if retry:
+            retried = self.generate_response_batch([self._build_input(complaint_texts[index]) for index in retry], iteration)
+            for index, chart in zip(retry, retried):
+                charts[index] = chart
+        return charts
+    
+    def generate_section_charts(self, sections: List[str], iteration: int = 1, on_token: Optional[Callable[[str], None]] = None) -> List[str]:
+        """
+        Generate one falsity chart per complaint section in a single request.
+        
+        Args:
+            sections: Complaint text split into sections
+            iteration: Current iteration number for logging
+            on_token: Optional callback receiving text chunks as they stream in
+            
+        Returns:
+            List of markdown charts, one per section
+            
+        Raises:
+            MissingBlocksError: If the response leaves out a section's chart
+        """
+        response = self.generate_response(self._build_sectioned_input(sections), iteration, on_token)
+        return parse_tagged_blocks(response, "CHART", len(sections))
+    
+    async def agenerate_section_charts(self, sections: List[str], iteration: int = 1, on_token: Optional[Callable[[str], None]] = None) -> List[str]:
+        """Async variant of generate_section_charts."""
+        response = await self.agenerate_response(self._build_sectioned_input(sections), iteration, on_token)
+        return parse_tagged_blocks(response, "CHART", len(sections))
+    
+    def _split(self, complaint_text: str) -> List[str]:
+        """Split long complaints into sections; short ones stay whole."""
+        if len(complaint_text) < config.SECTION_THRESHOLD_CHARS:
+            return [complaint_text]
+        return split_sections(complaint_text, config.SECTION_COUNT)
+    
+    def _log_whole_fallback(self, error: MissingBlocksError):
+        """Log that a sectioned response was incomplete and the complaint is charted whole."""
+        self._log("warning", f"[{self.agent_name}] {str(error)} - charting the complaint as a whole instead")
+    
+    def _build_input(self, complaint_text: str) -> str:
+        """Build the user input for the generator."""
+        return self._TEMPLATE.format_map({"complaint": complaint_text})
+    
+    def _build_sectioned_input(self, sections: List[str]) -> str:
+        """Build the user input for a multi-section request."""
+        count = len(sections)
+        return f"""The following complaint has been split into {count} sections. Use the full text for context, but chart each alleged misstatement under the section in which it appears.
+
+{build_sectioned_input(sections)}
+
+Return {count} falsity charts, one per section, each wrapped in tags: <CHART 1>...</CHART 1> through <CHART {count}>...</CHART {count}>. Use the same table columns in every chart."""
\ No newline at end of file
@@ -1,5 +1,42 @@
 from agents.base_agent import BaseAgent
 from config import config
+from typing import Callable, List, Optional, Tuple, Union
+import asyncio
+
+# Verdict the reviewer prompt asks for when every row passes
+APPROVAL_SENTINEL = "No issues"
+
+# Independent checks from the reviewer prompt, run concurrently for large charts
+REVIEW_ASPECTS: Tuple[Tuple[str, str], ...] = (
+    ("Paragraph Citations", "whether each row's content appears in the paragraph number it cites"),
+    ("Speaker, Date and Context", "whether each row's speaker, date and context match the Complaint"),
+    ("Quoted Misstatements", "whether each row's Misstatement accurately quotes the Complaint"),
+    ("Reasons for Falsity", "whether the Complaint applies each row's \"Why\" reasons to that specific Misstatement"),
+)
+
+class PrefixMatcher:
+    """
+    Incremental check of whether streamed text starts with a sentinel.
+    
+    Decides as soon as the text either starts with the sentinel or can no
+    longer do so, so a caller can stop reading a stream after a few tokens.
+    Leading whitespace and markdown emphasis/heading marks are ignored.
+    """
+    
+    def __init__(self, sentinel: str):
+        self.sentinel = sentinel.lower()
+        self.head = ""
+        self.matched: Optional[bool] = None
+    
+    def feed(self, text: str) -> bool:
+        """Feed the next chunk; returns True once the sentinel prefix is seen."""
+        if self.matched is None:
+            self.head = (self.head + text).lstrip(" \t\r\n*#")[:len(self.sentinel)].lower()
+            if self.head == self.sentinel:
+                self.matched = True
+            elif not self.sentinel.startswith(self.head):
+                self.matched = False
+        return bool(self.matched)
 
 class ReviewerAgent(BaseAgent):
     """Agent 2: Reviewer/QA Agent
@@ -7,10 +44,16 @@ class ReviewerAgent(BaseAgent):
     Reviews the generated falsity chart for errors and hallucinations.
     """
     
+    # Request body following the complaint
+    _TEMPLATE = (
+        "FALSITY CHART TO REVIEW:\n{chart}\n\n"
+        "Please review the falsity chart above against the original complaint and provide your audit findings."
+    )
+    
     def __init__(self):
         super().__init__(config.REVIEWER_PROMPT_PATH, agent_name="Reviewer")
     
-    def review_chart(self, complaint_text: str, chart: str, iteration: int = 1) -> str:
+    def review_chart(self, complaint_text: str, chart: str, iteration: int = 1, on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Review the falsity chart against the original complaint.
         
@@ -18,18 +61,94 @@ class ReviewerAgent(BaseAgent):
             complaint_text: Original complaint text
             chart: Generated falsity chart
             iteration: Current iteration number for logging
+            on_token: Optional callback receiving text chunks as they stream in
             
         Returns:
-            List of issues found (or "No issues" if chart is correct)
+            List of issues found (or "No issues" if chart is correct). With
+            REVIEW_EARLY_EXIT the review stops as soon as it opens with
+            "No issues", so an approval may be truncated.
         """
-        user_input = f"""Please review the following falsity chart against the original complaint.
-
-ORIGINAL COMPLAINT:
-{complaint_text}
-
-FALSITY CHART TO REVIEW:
-{chart}
-
-Please provide your audit findings."""
+        return self.generate_response(self._build_input(complaint_text, chart), iteration, on_token, self._early_exit())
+    
+    async def areview_chart(self, complaint_text: str, chart: str, iteration: int = 1, on_token: Optional[Callable[[str], None]] = None,
+                            approves: Optional[Callable[[str], bool]] = None) -> str:
+        """Async variant of review_chart; large charts may be split into aspect reviews judged by approves."""
+        if self._use_aspects(chart):
+            return await self.areview_chart_aspects(complaint_text, chart, iteration, on_token, approves)
+        return await self.agenerate_response(self._build_input(complaint_text, chart), iteration, on_token, self._early_exit())
+    
+    async def areview_chart_aspects(self, complaint_text: str, chart: str, iteration: int = 1,
+                                    on_token: Optional[Callable[[str], None]] = None,
+                                    approves: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Review the chart as one concurrent Reviewer call per REVIEW_ASPECTS entry.
         
-        return self.generate_response(user_input, iteration)
\ No newline at end of file
+        Args:
+            complaint_text: Original complaint text
+            chart: Generated falsity chart
+            iteration: Current iteration number for logging
+            on_token: Optional callback receiving text chunks from every aspect
+            approves: Decides whether one aspect's findings approve the chart
+                (by default, whether they open with "No issues")
+            
+        Returns:
+            Findings for each aspect under its own heading, led by "No issues"
+            if every aspect approved the chart. Otherwise only the aspects
+            with findings are reported, so approvals from the others can't
+            outweigh them.
+        """
+        if approves is None:
+            approves = lambda finding: PrefixMatcher(APPROVAL_SENTINEL).feed(finding)
+        
+        findings = await asyncio.gather(*(
+            self.agenerate_response(self._build_aspect_input(complaint_text, chart, instruction), iteration, on_token, self._early_exit())
+            for _, instruction in REVIEW_ASPECTS
+        ))
+        verdicts = [approves(finding) for finding in findings]
+        
+        report = "\n\n".join(
+            f"## {name}\n{finding.strip()}"
+            for (name, _), finding, approved in zip(REVIEW_ASPECTS, findings, verdicts)
+            if all(verdicts) or not approved
+        )
+        if all(verdicts):
+            return f"{APPROVAL_SENTINEL}\n\n{report}"
+        return report
+    
+    def review_charts_batch(self, complaint_texts: List[str], charts: List[str], iteration: int = 1) -> List[Union[str, Exception]]:
+        """
+        Review several charts in one Gemini Batch API job.
+        
+        Args:
+            complaint_texts: Original complaint text for each chart
+            charts: Falsity chart to review for each complaint
+            iteration: Current iteration number for logging
+            
+        Returns:
+            Audit findings for each chart, in order, or the error for each
+            request that failed
+        """
+        return self.generate_response_batch([
+            self._build_input(complaint_text, chart)
+            for complaint_text, chart in zip(complaint_texts, charts)
+        ], iteration)
+    
+    def _early_exit(self) -> Optional[Callable[[str], bool]]:
+        """Stop streaming the review as soon as it opens with the approval sentinel."""
+        if not config.REVIEW_EARLY_EXIT:
+            return None
+        return PrefixMatcher(APPROVAL_SENTINEL).feed
+    
+    def _use_aspects(self, chart: str) -> bool:
+        """Whether a chart is large enough to review as concurrent aspects."""
+        return config.REVIEW_ASPECTS_ENABLED and not self.batch_mode and len(chart) >= config.REVIEW_ASPECT_THRESHOLD_CHARS
+    
+    def _build_aspect_input(self, complaint_text: str, chart: str, instruction: str) -> str:
+        """Build the reviewer input restricted to a single aspect check."""
+        return f"""{self._build_input(complaint_text, chart)}
+
+For this audit, perform only one check: {instruction}. Skip all other checks and report only discrepancies of this kind."""
+    
+    def _build_input(self, complaint_text: str, chart: str) -> str:
+        """Build the user input for the reviewer, with the stable complaint first."""
+        return self._with_complaint(complaint_text, self._TEMPLATE.format_map({"chart": chart}))
\ No newline at end of file
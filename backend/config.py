@@ -1,18 +1,64 @@
 import os
+from dataclasses import dataclass, field
+from typing import ClassVar, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+@dataclass(frozen=True, slots=True)
 class Config:
-    GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-    MODEL_NAME = os.getenv("MODEL_NAME", "gemini-3-pro-preview")
-    MAX_ITERATIONS = 3
-    MAX_TOKENS = 32000  # Increased for large documents - Gemini 2.0 supports up to 32k output
-    TEMPERATURE = 0.1
+    # Read from the environment when the Config instance is created
+    GOOGLE_API_KEY: Optional[str] = field(default_factory=lambda: os.getenv("GOOGLE_API_KEY"))
+    MODEL_NAME: str = field(default_factory=lambda: os.getenv("MODEL_NAME", "gemini-3-pro-preview"))
+    
+    # Per-attempt Gemini timeout; full charts for long complaints can take minutes
+    REQUEST_TIMEOUT: float = field(default_factory=lambda: float(os.getenv("GEMINI_TIMEOUT", "300")))
+    
+    # Explicit Gemini context caching of the complaint for Reviewer/Fixer calls
+    CONTEXT_CACHE_ENABLED: bool = field(default_factory=lambda: os.getenv("GEMINI_CONTEXT_CACHE", "false").lower() == "true")
+    
+    # Draft, review and fix the chart in a single Gemini call per iteration
+    FUSED_MODE: bool = field(default_factory=lambda: os.getenv("GEMINI_FUSED_MODE", "false").lower() == "true")
+    
+    # Review large charts as concurrent per-aspect Reviewer calls (async runs only)
+    REVIEW_ASPECTS_ENABLED: bool = field(default_factory=lambda: os.getenv("GEMINI_REVIEW_ASPECTS", "false").lower() == "true")
+    
+    MAX_ITERATIONS: ClassVar[int] = 3
+    MAX_TOKENS: ClassVar[int] = 32000  # Increased for large documents - Gemini 2.0 supports up to 32k output
+    TEMPERATURE: ClassVar[float] = 0.1
+    
+    REQUEST_MAX_ATTEMPTS: ClassVar[int] = 3
+    RETRY_BACKOFF_BASE: ClassVar[float] = 2.0  # seconds
+    
+    # Stop streaming a review as soon as it opens with "No issues"
+    REVIEW_EARLY_EXIT: ClassVar[bool] = True
+    
+    # Charts shorter than this are reviewed in a single call even with aspects enabled
+    REVIEW_ASPECT_THRESHOLD_CHARS: ClassVar[int] = 20000
+    
+    # Long complaints are split into sections that share a single Gemini call
+    SECTION_COUNT: ClassVar[int] = 4
+    SECTION_THRESHOLD_CHARS: ClassVar[int] = 150000
+    
+    # Seconds between status checks for Gemini Batch API jobs
+    BATCH_POLL_INTERVAL: ClassVar[int] = 10
+    
+    CONTEXT_CACHE_TTL: ClassVar[int] = 1800  # seconds; caches are deleted when the run ends
+    CONTEXT_CACHE_MIN_TOKENS: ClassVar[int] = 4096  # Gemini's minimum cacheable context
+    CHARS_PER_TOKEN: ClassVar[int] = 4  # for estimating token counts from text length
+    
+    # PDFs at least this large (bytes) have their pages split across worker processes
+    PDF_PROCESS_POOL_THRESHOLD: ClassVar[int] = 2 * 1024 * 1024
+    PDF_POOL_WORKERS: ClassVar[int] = 2
+    
+    # Uploaded complaint text cache (by content hash)
+    TEXT_CACHE_MAX_ENTRIES: ClassVar[int] = 128
+    TEXT_CACHE_MAX_CHARS: ClassVar[int] = 256 * 1024 * 1024
     
     # Prompt file paths
-    GENERATOR_PROMPT_PATH = "prompts/generator.txt"
-    REVIEWER_PROMPT_PATH = "prompts/reviewer.txt"
-    FIXER_PROMPT_PATH = "prompts/fixer.txt"
+    GENERATOR_PROMPT_PATH: ClassVar[str] = "prompts/generator.txt"
+    REVIEWER_PROMPT_PATH: ClassVar[str] = "prompts/reviewer.txt"
+    FIXER_PROMPT_PATH: ClassVar[str] = "prompts/fixer.txt"
+    FUSED_PROMPT_PATH: ClassVar[str] = "prompts/fused.txt"
 
 config = Config()
\ No newline at end of file
@@ -1,16 +1,22 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+import functools
+import hashlib
 import io
 import logging
-import json
+import multiprocessing
 import asyncio
+import orjson
 from typing import Optional, Dict
-from queue import Queue
-import threading
 
-from orchestrator import Orchestrator
-from utils.pdf_extractor import extract_text_from_pdf, validate_complaint_text
+from config import config
+from orchestrator import acquire_orchestrator, release_orchestrator, borrow_orchestrator
+from utils.pdf_extractor import count_pages, extract_page_range, extract_text_from_pdf, join_pages, validate_complaint_text
+from utils.text_cache import TextCache
 from models import ProcessingResult, UploadResponse, ErrorResponse
 
 # Configure root logging
@@ -20,10 +26,40 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Extracted text keyed by upload content hash, so /api/upload followed by
+# /api/process (or a retry) doesn't parse the same file twice.
+# Files that failed validation are cached as "".
+complaint_cache = TextCache(
+    max_entries=config.TEXT_CACHE_MAX_ENTRIES,
+    max_chars=config.TEXT_CACHE_MAX_CHARS
+)
+
+# Worker processes for extracting large PDFs' pages in parallel
+pdf_pool: Optional[ProcessPoolExecutor] = None
+
+def _new_pdf_pool() -> ProcessPoolExecutor:
+    """Create the PDF extraction process pool."""
+    # Spawned, not forked: a fork taken while a thread holds the PDFium lock
+    # (or is inside PDFium, gRPC or logging) leaves the worker deadlocked
+    return ProcessPoolExecutor(max_workers=config.PDF_POOL_WORKERS,
+                               mp_context=multiprocessing.get_context("spawn"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the PDF process pool with the app and shut it down on exit."""
+    global pdf_pool
+    pdf_pool = _new_pdf_pool()
+    try:
+        yield
+    finally:
+        pdf_pool.shutdown(wait=False, cancel_futures=True)
+        pdf_pool = None
+
 app = FastAPI(
     title="Falsity Chart Generator API",
     description="Multi-agent system for generating falsity charts from legal complaints",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS - Allow all origins
@@ -35,6 +71,111 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _extract_and_validate(filename: str, content: bytes) -> Optional[str]:
+    """Extract complaint text from file content; None if it fails validation."""
+    if filename.endswith('.pdf'):
+        text = extract_text_from_pdf(io.BytesIO(content))
+    else:
+        text = content.decode('utf-8')
+    
+    return text if validate_complaint_text(text) else None
+
+async def extract_pdf_in_pool(content: bytes) -> str:
+    """
+    Extract a PDF's text with its pages split across the worker processes.
+    
+    PDFium isn't thread-safe, so each worker opens its own copy of the
+    document and extracts one contiguous range of pages. The page count is
+    also read in a worker rather than competing with threaded extractions.
+    
+    If a worker dies (e.g. PDFium crashing on a malformed file), the pool is
+    replaced for later uploads and this one is extracted on a thread.
+    """
+    global pdf_pool
+    pool = pdf_pool
+    loop = asyncio.get_running_loop()
+    try:
+        page_count = await loop.run_in_executor(pool, count_pages, content)
+        step = max(1, -(-page_count // config.PDF_POOL_WORKERS))
+        
+        ranges = await asyncio.gather(*(
+            loop.run_in_executor(pool, extract_page_range, content, start, start + step)
+            for start in range(0, page_count, step)
+        ))
+    except BrokenProcessPool:
+        logging.warning("PDF process pool broke; replacing it and extracting on a thread")
+        # Concurrent uploads may all see the same broken pool; replace it once
+        if pdf_pool is pool:
+            pdf_pool = _new_pdf_pool()
+            pool.shutdown(wait=False, cancel_futures=True)
+        return await asyncio.to_thread(extract_text_from_pdf, io.BytesIO(content))
+    return join_pages([page for pages in ranges for page in pages])
+
+async def read_complaint(file: UploadFile) -> str:
+    """
+    Read an uploaded complaint and return its validated text.
+    
+    Parsing and validation run off the event loop; large PDFs have their
+    pages extracted in parallel by the process pool.
+    
+    Args:
+        file: Uploaded PDF or text file
+        
+    Returns:
+        Extracted complaint text
+    """
+    # Validate file type
+    if not file.filename.endswith(('.pdf', '.txt')):
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF and TXT files are supported"
+        )
+    
+    # Read file content
+    content = await file.read()
+    
+    is_pdf = file.filename.endswith('.pdf')
+    cache_key = (is_pdf, hashlib.blake2b(content, digest_size=16).digest())
+    text = complaint_cache.get(cache_key)
+    
+    if text is None:
+        if pdf_pool and is_pdf and len(content) >= config.PDF_PROCESS_POOL_THRESHOLD:
+            text = await extract_pdf_in_pool(content)
+            text = text if validate_complaint_text(text) else None
+        else:
+            text = await asyncio.to_thread(_extract_and_validate, file.filename, content)
+        text = text or ""
+        complaint_cache.put(cache_key, text)
+    
+    if not text:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid complaint text. Please ensure the file contains a legal complaint."
+        )
+    
+    return text
+
+def _sse_frame(update: Dict) -> bytes:
+    """Encode an update as a Server-Sent Events data frame."""
+    return b"data: " + orjson.dumps(update) + b"\n\n"
+
+@functools.lru_cache(maxsize=256)
+def _progress_frame(step: str, iteration: int, max_iterations: int, message: str) -> bytes:
+    """Progress updates repeat across runs, so their frames are encoded once."""
+    return _sse_frame({
+        "type": "progress",
+        "step": step,
+        "iteration": iteration,
+        "max_iterations": max_iterations,
+        "message": message
+    })
+
+def encode_sse(update: Dict) -> bytes:
+    """Encode an update for the SSE stream, reusing cached progress frames."""
+    if update["type"] == "progress":
+        return _progress_frame(update["step"], update["iteration"], update["max_iterations"], update["message"])
+    return _sse_frame(update)
+
 @app.get("/")
 async def root():
     """Health check endpoint."""
@@ -56,29 +197,8 @@ async def upload_file(file: UploadFile = File(...)):
         Upload confirmation with extracted text length
     """
     try:
-        # Validate file type
-        if not file.filename.endswith(('.pdf', '.txt')):
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF and TXT files are supported"
-            )
-        
-        # Read file content
-        content = await file.read()
-        
-        # Extract text based on file type
-        if file.filename.endswith('.pdf'):
-            pdf_file = io.BytesIO(content)
-            text = extract_text_from_pdf(pdf_file)
-        else:
-            text = content.decode('utf-8')
-        
-        # Validate extracted text
-        if not validate_complaint_text(text):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid complaint text. Please ensure the file contains a legal complaint."
-            )
+        # Read, extract and validate text
+        text = await read_complaint(file)
         
         return UploadResponse(
             message="File uploaded successfully",
@@ -95,45 +215,29 @@ async def upload_file(file: UploadFile = File(...)):
         )
 
 @app.post("/api/process", response_model=ProcessingResult)
-async def process_complaint(file: UploadFile = File(...)):
+async def process_complaint(file: UploadFile = File(...), batch: bool = False):
     """
     Process a complaint file through the multi-agent workflow.
     
     Args:
         file: PDF or text file containing the complaint
+        batch: Use the Gemini Batch API (cheaper, but may take minutes)
         
     Returns:
         Processing result with final chart and iteration history
     """
     try:
-        # Validate file type
-        if not file.filename.endswith(('.pdf', '.txt')):
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF and TXT files are supported"
-            )
+        # Read, extract and validate text
+        complaint_text = await read_complaint(file)
         
-        # Read and extract text
-        content = await file.read()
-        
-        if file.filename.endswith('.pdf'):
-            pdf_file = io.BytesIO(content)
-            complaint_text = extract_text_from_pdf(pdf_file)
-        else:
-            complaint_text = content.decode('utf-8')
-        
-        # Validate text
-        if not validate_complaint_text(complaint_text):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid complaint text. Please ensure the file contains a legal complaint."
-            )
-        
-        # Create a new orchestrator for each request to get fresh logging
-        orchestrator = Orchestrator()
-        
-        # Process through orchestrator
-        result = orchestrator.process_complaint(complaint_text)
+        # Borrow a pooled orchestrator; it gets fresh logging for this request
+        async with borrow_orchestrator(batch_mode=batch) as orchestrator:
+            # Process through orchestrator without blocking the event loop
+            if batch:
+                # Batch jobs are polled synchronously, so keep them off the event loop
+                result = await asyncio.to_thread(orchestrator.process_complaint, complaint_text)
+            else:
+                result = await orchestrator.aprocess_complaint(complaint_text)
         
         return ProcessingResult(**result)
     
@@ -158,37 +262,23 @@ async def process_complaint_stream(file: UploadFile = File(...)):
         SSE stream with progress updates and final result
     """
     try:
-        # Validate file type
-        if not file.filename.endswith(('.pdf', '.txt')):
-            raise HTTPException(
-                status_code=400,
-                detail="Only PDF and TXT files are supported"
-            )
-        
-        # Read and extract text
-        content = await file.read()
+        # Read, extract and validate text
+        complaint_text = await read_complaint(file)
         
-        if file.filename.endswith('.pdf'):
-            pdf_file = io.BytesIO(content)
-            complaint_text = extract_text_from_pdf(pdf_file)
-        else:
-            complaint_text = content.decode('utf-8')
+        # Queue for progress updates, fed from the orchestrator's worker thread
+        loop = asyncio.get_running_loop()
+        progress_queue: asyncio.Queue = asyncio.Queue()
         
-        # Validate text
-        if not validate_complaint_text(complaint_text):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid complaint text. Please ensure the file contains a legal complaint."
-            )
-        
-        # Create a queue for progress updates
-        progress_queue: Queue = Queue()
-        result_holder: Dict = {}
-        error_holder: Dict = {}
+        def publish(update: Dict):
+            """Hand an update to the event loop from the worker thread."""
+            loop.call_soon_threadsafe(progress_queue.put_nowait, update)
         
         def progress_callback(step: str, iteration: int, max_iterations: int, message: str):
             """Callback to receive progress updates from orchestrator."""
-            progress_queue.put({
+            if step == "token":
+                publish({"type": "token", "text": message})
+                return
+            publish({
                 "type": "progress",
                 "step": step,
                 "iteration": iteration,
@@ -196,52 +286,43 @@ async def process_complaint_stream(file: UploadFile = File(...)):
                 "message": message
             })
         
-        def run_processing():
-            """Run the processing in a separate thread."""
+        orchestrator = acquire_orchestrator(progress_callback=progress_callback)
+        
+        def run() -> Dict:
+            """Process in the worker thread; the orchestrator goes back to the pool only once it's idle."""
             try:
-                orchestrator = Orchestrator(progress_callback=progress_callback)
-                result = orchestrator.process_complaint(complaint_text)
-                result_holder["data"] = result
-                progress_queue.put({"type": "complete", "result": result})
-            except Exception as e:
-                error_holder["error"] = str(e)
-                progress_queue.put({"type": "error", "message": str(e)})
+                return orchestrator.process_complaint(complaint_text)
+            finally:
+                release_orchestrator(orchestrator)
+        
+        task = asyncio.create_task(asyncio.to_thread(run))
         
-        # Start processing in background thread
-        thread = threading.Thread(target=run_processing)
-        thread.start()
+        def on_done(finished: asyncio.Task):
+            """Publish the final event once processing finishes."""
+            if finished.cancelled():
+                return
+            if finished.exception():
+                progress_queue.put_nowait({"type": "error", "message": str(finished.exception())})
+            else:
+                progress_queue.put_nowait({"type": "complete", "result": finished.result()})
+        
+        task.add_done_callback(on_done)
         
         async def event_generator():
-            """Generate SSE events from the progress queue."""
-            while True:
-                # Check for updates with a small timeout
-                try:
-                    # Use asyncio to avoid blocking
-                    await asyncio.sleep(0.1)
-                    
-                    while not progress_queue.empty():
-                        update = progress_queue.get_nowait()
-                        
-                        if update["type"] == "complete":
-                            # Send final result
-                            yield f"data: {json.dumps(update)}\n\n"
-                            return
-                        elif update["type"] == "error":
-                            yield f"data: {json.dumps(update)}\n\n"
-                            return
-                        else:
-                            # Send progress update
-                            yield f"data: {json.dumps(update)}\n\n"
+            """Generate SSE events as soon as updates arrive."""
+            try:
+                while True:
+                    update = await progress_queue.get()
+                    yield encode_sse(update)
                     
-                    # Check if thread is still alive
-                    if not thread.is_alive() and progress_queue.empty():
-                        if error_holder:
-                            yield f"data: {json.dumps({'type': 'error', 'message': error_holder.get('error', 'Unknown error')})}\n\n"
+                    # Processing always finishes with a complete or error event
+                    if update["type"] in ("complete", "error"):
                         return
-                        
-                except Exception as e:
-                    yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
-                    return
+            finally:
+                # Client disconnected before completion - stop the run
+                if not task.done():
+                    orchestrator.cancel()
+                    task.cancel()
         
         return StreamingResponse(
             event_generator(),
@@ -12,7 +12,7 @@ class ProcessingResult(BaseModel):
     final_chart: str
     iterations: int
     history: List[IterationData]
-    status: str  # "approved" or "max_iterations_reached"
+    status: str  # "approved", "max_iterations_reached", "reviewer_failed", "fixer_failed" or (batch runs) "generator_failed"
     log_file: Optional[str] = None  # Path to the log file for this run
 
 class UploadResponse(BaseModel):
@@ -1,10 +1,78 @@
+from agents.base_agent import estimate_tokens
 from agents.generator_agent import GeneratorAgent
 from agents.reviewer_agent import ReviewerAgent
 from agents.fixer_agent import FixerAgent
+from agents.fused_agent import FusedAgent, FusedResponseError
 from utils.logger import RunLogger
 from config import config
-from typing import Dict, List, Optional, Callable, AsyncGenerator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager
+from typing import Dict, FrozenSet, List, Optional, Callable, AsyncGenerator, Tuple, Union
+from collections import Counter
 import asyncio
+import hashlib
+import queue
+import re
+import threading
+
+# Reviewer table cells that mean the chart will need fixing
+ISSUE_MARKERS = ("| **fail**", "| **warning**")
+
+# Reviewer phrases that indicate the chart is good
+APPROVAL_PHRASES: Tuple[str, ...] = (
+    "no issues",
+    "no discrepancies",
+    "all correct",
+    "chart is correct",
+    "passes all checks",
+    "no errors found",
+    "highly accurate",
+    "is accurate",
+    "all pass",
+    "no hallucinations",
+    "no errors",
+    "verified that every entry is accurate",
+)
+
+# Reviewer phrases that indicate problems
+REJECTION_PHRASES: Tuple[str, ...] = (
+    "fail",
+    "error:",
+    "hallucination:",
+    "citation error",
+    "quote error",
+    "attribution error",
+    "warning:",
+    "needs correction",
+    "incorrect",
+    "mismatch",
+)
+
+# Every approval and rejection phrase in one case-insensitive pattern, so a
+# single pass over the review finds them all. It is a lookahead so overlapping
+# phrases ("citation error" / "error:") are all found, but only one phrase is
+# recorded per position. That is exact only while no approval phrase and
+# rejection phrase can start at the same position (neither is a prefix of one
+# in the other group), within each group longer phrases come before their
+# prefixes ("no errors found" before "no errors"), and no rejection phrase is a
+# prefix of another, since each one found is checked for negation separately.
+# tests/test_approval.py enforces this.
+_PHRASE_RE = re.compile(
+    "(?=(?P<approval>" + "|".join(map(re.escape, APPROVAL_PHRASES)) + ")"
+    "|(?P<rejection>" + "|".join(map(re.escape, REJECTION_PHRASES)) + "))",
+    re.IGNORECASE
+)
+
+# Negated rejection phrases, as in "no hallucination"
+NEGATION_PREFIX = "no "
+_NEGATION_SET: FrozenSet[str] = frozenset(NEGATION_PREFIX + phrase for phrase in REJECTION_PHRASES)
+_STATUS_RE = re.compile(r"\| \*\*(pass|fail|warning)\*\*", re.IGNORECASE)
+
+# Creates Gemini context caches for sync runs while the Generator is busy
+_CACHE_PREP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="context-cache")
+
+class ProcessingCancelled(Exception):
+    """Raised inside a synchronous run once cancel() has been requested."""
 
 class Orchestrator:
     """
@@ -15,19 +83,103 @@ class Orchestrator:
     4. Repeat until no issues or max iterations reached
     """
     
-    def __init__(self, progress_callback: Optional[Callable[[str, int, int, str], None]] = None):
+    def __init__(self, progress_callback: Optional[Callable[[str, int, int, str], None]] = None, batch_mode: bool = False):
         self.generator = GeneratorAgent()
         self.reviewer = ReviewerAgent()
         self.fixer = FixerAgent()
+        self.fused = FusedAgent() if config.FUSED_MODE else None
+        
         self.max_iterations = config.MAX_ITERATIONS
-        self.logger = RunLogger()
+        self._cancelled = threading.Event()
+        self._approval_memo: Dict[bytes, bool] = {}
+        self.reset(progress_callback=progress_callback, batch_mode=batch_mode)
+    
+    def reset(self, logger: Optional[RunLogger] = None,
+              progress_callback: Optional[Callable[[str, int, int, str], None]] = None,
+              batch_mode: bool = False):
+        """
+        Prepare this orchestrator for a new request without rebuilding its agents.
+        
+        Args:
+            logger: Logger for the next run (a fresh RunLogger by default)
+            progress_callback: Receives progress updates for the next run
+            batch_mode: Route agent calls through the Gemini Batch API (slower, cheaper)
+        """
+        self.logger = logger or RunLogger()
         self.progress_callback = progress_callback
+        self.batch_mode = batch_mode
+        self._cancelled.clear()
+        self._approval_memo.clear()
+        
+        for agent in (self.generator, self.reviewer, self.fixer, self.fused):
+            if agent is None:
+                continue
+            agent.set_logger(self.logger)
+            agent.batch_mode = batch_mode
+            # Cached responses and context caches belong to the previous request
+            agent._response_cache.clear()
+            agent.clear_context_cache()
+            # Prompt files may have been edited since; cheap when unchanged
+            agent.refresh_prompt()
+    
+    def _token_callback(self, iteration: int) -> Optional[Callable[[str], None]]:
+        """Forward streamed agent text as "token" progress events, if anyone is listening."""
+        if not self.progress_callback:
+            return None
+        return lambda text: self.progress_callback("token", iteration, self.max_iterations, text)
+    
+    def cancel(self):
+        """Ask a running process_complaint to stop before its next agent call."""
+        self._cancelled.set()
+    
+    def _check_cancelled(self):
+        """Raise if cancel() was requested (sync runs in worker threads only)."""
+        if self._cancelled.is_set():
+            raise ProcessingCancelled("Processing cancelled")
     
     def _emit_progress(self, step: str, iteration: int, max_iterations: int, message: str):
         """Emit progress update if callback is set."""
         if self.progress_callback:
             self.progress_callback(step, iteration, max_iterations, message)
     
+    def _begin_run(self, complaint_text: Optional[str] = None):
+        """Start a new logging run, point every agent at it and log the complaint."""
+        self.logger.start_run()
+        for agent in (self.generator, self.reviewer, self.fixer, self.fused):
+            if agent is not None:
+                agent.set_logger(self.logger)
+        
+        if complaint_text is not None:
+            self.logger.log_info("Complaint text length: %d characters (~%d tokens)",
+                                 len(complaint_text), estimate_tokens(complaint_text))
+            self.logger.log_debug("Complaint preview: %s...", complaint_text[:500])
+    
+    def _iteration_record(self, iteration: int, chart: str, issues: str) -> Dict:
+        """History entry for one review of a chart."""
+        return {
+            "iteration": iteration,
+            "chart": chart,
+            "issues": issues
+        }
+    
+    def _finish_run(self, chart: str, iterations: int, history: List[Dict], status: str) -> Dict:
+        """Log the final result, end the run and build the result dictionary."""
+        self.logger.log_final_result(status, iterations, chart)
+        log_file = self.logger.end_run()
+        return {
+            "final_chart": chart,
+            "iterations": iterations,
+            "history": history,
+            "status": status,
+            "log_file": log_file
+        }
+    
+    def _fail_run(self, error: Exception):
+        """Log and report a run that is aborting with error, and end it."""
+        self.logger.log_error(f"Processing failed: {str(error)}")
+        self._emit_progress("error", 0, self.max_iterations, f"Processing failed: {str(error)}")
+        self.logger.end_run()
+    
     def process_complaint(self, complaint_text: str) -> Dict:
         """
         Process a complaint through the multi-agent workflow.
@@ -42,23 +194,27 @@ class Orchestrator:
                 - history: List of all iterations with charts and issues
                 - log_file: Path to the log file for this run
         """
-        # Start a new logging run
-        run_id = self.logger.start_run()
-        
-        # Set logger for all agents
-        self.generator.set_logger(self.logger)
-        self.reviewer.set_logger(self.logger)
-        self.fixer.set_logger(self.logger)
+        self._begin_run(complaint_text)
         
-        # Log complaint info
-        self.logger.log_info(f"Complaint text length: {len(complaint_text)} characters")
-        self.logger.log_debug(f"Complaint preview: {complaint_text[:500]}...")
+        # Fused mode does the whole workflow in one call per iteration
+        if self._use_fused():
+            result = self._run_fused(complaint_text)
+            if result is not None:
+                return result
         
         history = []
         current_chart = None
         
+        # Cache the complaint for the agents that see it every iteration. The
+        # Generator doesn't use the caches, so they are created alongside it.
+        cache_prep: Dict[object, Future] = {
+            agent: _CACHE_PREP_POOL.submit(agent.create_context_cache, complaint_text)
+            for agent in self._context_cached_agents(complaint_text)
+        }
+        
         try:
             for iteration in range(1, self.max_iterations + 1):
+                self._check_cancelled()
                 self.logger.log_iteration_start(iteration, self.max_iterations)
                 self._emit_progress("iteration_start", iteration, self.max_iterations, f"Starting iteration {iteration}")
                 
@@ -67,7 +223,7 @@ class Orchestrator:
                     self.logger.log_info("Step 1: Generating initial chart...")
                     self._emit_progress("generating", iteration, self.max_iterations, "Agent 1: Generating initial falsity chart...")
                     try:
-                        current_chart = self.generator.generate_chart(complaint_text, iteration)
+                        current_chart = self.generator.generate_chart(complaint_text, iteration, self._token_callback(iteration))
                         self._emit_progress("generated", iteration, self.max_iterations, "Chart generation complete")
                     except Exception as e:
                         self.logger.log_error(f"Generator failed: {str(e)}")
@@ -75,10 +231,13 @@ class Orchestrator:
                         raise  # Generator failure is critical - we can't continue without a chart
                 
                 # Step 2: Review the chart
+                self._check_cancelled()
                 self.logger.log_info("Step 2: Reviewing chart...")
                 self._emit_progress("reviewing", iteration, self.max_iterations, "Agent 2: Reviewing chart for accuracy...")
                 try:
-                    issues = self.reviewer.review_chart(complaint_text, current_chart, iteration)
+                    if self.reviewer in cache_prep:
+                        cache_prep[self.reviewer].result()
+                    issues = self.reviewer.review_chart(complaint_text, current_chart, iteration, self._token_callback(iteration))
                     self._emit_progress("reviewed", iteration, self.max_iterations, "Review complete")
                 except Exception as e:
                     # Reviewer failed (likely safety filter) - return current chart as final
@@ -87,31 +246,11 @@ class Orchestrator:
                     self._emit_progress("reviewer_failed", iteration, self.max_iterations, "Reviewer unavailable - returning chart")
                     
                     # Store iteration data with error note
-                    iteration_data = {
-                        "iteration": iteration,
-                        "chart": current_chart,
-                        "issues": f"Reviewer unavailable: {str(e)}"
-                    }
-                    history.append(iteration_data)
-                    
-                    self.logger.log_final_result("reviewer_failed", iteration, current_chart)
-                    log_file = self.logger.end_run()
-                    
-                    return {
-                        "final_chart": current_chart,
-                        "iterations": iteration,
-                        "history": history,
-                        "status": "reviewer_failed",
-                        "log_file": log_file
-                    }
+                    history.append(self._iteration_record(iteration, current_chart, f"Reviewer unavailable: {str(e)}"))
+                    return self._finish_run(current_chart, iteration, history, "reviewer_failed")
                 
                 # Store iteration data
-                iteration_data = {
-                    "iteration": iteration,
-                    "chart": current_chart,
-                    "issues": issues
-                }
-                history.append(iteration_data)
+                history.append(self._iteration_record(iteration, current_chart, issues))
                 
                 # Check if chart is approved
                 is_approved = self._is_chart_approved(issues)
@@ -119,23 +258,18 @@ class Orchestrator:
                 
                 # Step 3: Check if we're done
                 if is_approved:
-                    self.logger.log_final_result("approved", iteration, current_chart)
                     self._emit_progress("complete", iteration, self.max_iterations, "Chart approved!")
-                    log_file = self.logger.end_run()
-                    return {
-                        "final_chart": current_chart,
-                        "iterations": iteration,
-                        "history": history,
-                        "status": "approved",
-                        "log_file": log_file
-                    }
+                    return self._finish_run(current_chart, iteration, history, "approved")
                 
                 # Step 4: Fix the chart if not on last iteration
                 if iteration < self.max_iterations:
+                    self._check_cancelled()
                     self.logger.log_info("Step 3: Fixing chart based on issues...")
                     self._emit_progress("fixing", iteration, self.max_iterations, "Agent 3: Fixing identified issues...")
                     try:
-                        current_chart = self.fixer.fix_chart(complaint_text, current_chart, issues, iteration)
+                        if self.fixer in cache_prep:
+                            cache_prep[self.fixer].result()
+                        current_chart = self.fixer.fix_chart(complaint_text, current_chart, issues, iteration, self._token_callback(iteration))
                         self._emit_progress("fixed", iteration, self.max_iterations, "Fixes applied")
                     except Exception as e:
                         # Fixer failed - return current chart as final
@@ -143,39 +277,383 @@ class Orchestrator:
                         self.logger.log_warning("Returning chart without fixes due to fixer failure")
                         self._emit_progress("fixer_failed", iteration, self.max_iterations, "Fixer unavailable - returning chart")
                         
-                        self.logger.log_final_result("fixer_failed", iteration, current_chart)
-                        log_file = self.logger.end_run()
+                        return self._finish_run(current_chart, iteration, history, "fixer_failed")
+                else:
+                    self.logger.log_warning("Max iterations reached - returning best effort chart")
+                    self._emit_progress("max_iterations", iteration, self.max_iterations, "Max iterations reached")
+            
+            # Return final chart even if not fully approved
+            self._emit_progress("complete", self.max_iterations, self.max_iterations, "Processing complete")
+            return self._finish_run(current_chart, self.max_iterations, history, "max_iterations_reached")
+            
+        except Exception as e:
+            self._fail_run(e)
+            raise
+        finally:
+            # Let cache creation finish before deleting the caches
+            wait(cache_prep.values())
+            for agent in cache_prep:
+                agent.clear_context_cache()
+    
+    async def aprocess_complaint(self, complaint_text: str) -> Dict:
+        """
+        Process a complaint through the multi-agent workflow without blocking
+        the event loop. Mirrors process_complaint using the async agent calls.
+        
+        Args:
+            complaint_text: Full text of the legal complaint
+            
+        Returns:
+            Dictionary containing:
+                - final_chart: The final falsity chart
+                - iterations: Number of iterations performed
+                - history: List of all iterations with charts and issues
+                - log_file: Path to the log file for this run
+        """
+        self._begin_run(complaint_text)
+        
+        # Fused mode does the whole workflow in one call per iteration
+        if self._use_fused():
+            result = await self._arun_fused(complaint_text)
+            if result is not None:
+                return result
+        
+        history = []
+        current_chart = None
+        cached_agents = self._context_cached_agents(complaint_text)
+        fixer_prep: Dict[str, asyncio.Task] = {}
+        
+        # Cache the complaint for the Reviewer while the Generator runs. The
+        # Fixer's cache is only needed once a review finds issues, so it is
+        # prepared speculatively while the review streams in.
+        reviewer_prep: Optional[asyncio.Task] = None
+        if self.reviewer in cached_agents:
+            reviewer_prep = asyncio.create_task(asyncio.to_thread(self.reviewer.create_context_cache, complaint_text))
+        
+        try:
+            for iteration in range(1, self.max_iterations + 1):
+                self.logger.log_iteration_start(iteration, self.max_iterations)
+                self._emit_progress("iteration_start", iteration, self.max_iterations, f"Starting iteration {iteration}")
+                
+                # Step 1: Generate or use existing chart
+                if iteration == 1:
+                    self.logger.log_info("Step 1: Generating initial chart...")
+                    self._emit_progress("generating", iteration, self.max_iterations, "Agent 1: Generating initial falsity chart...")
+                    try:
+                        current_chart = await self.generator.agenerate_chart(complaint_text, iteration, self._token_callback(iteration))
+                        self._emit_progress("generated", iteration, self.max_iterations, "Chart generation complete")
+                    except Exception as e:
+                        self.logger.log_error(f"Generator failed: {str(e)}")
+                        self._emit_progress("error", iteration, self.max_iterations, f"Generator failed: {str(e)}")
+                        raise  # Generator failure is critical - we can't continue without a chart
+                
+                # Step 2: Review the chart
+                self.logger.log_info("Step 2: Reviewing chart...")
+                self._emit_progress("reviewing", iteration, self.max_iterations, "Agent 2: Reviewing chart for accuracy...")
+                try:
+                    on_review_token = self._token_callback(iteration)
+                    if self.fixer in cached_agents:
+                        on_review_token = self._watch_review_for_issues(complaint_text, fixer_prep, on_review_token)
+                    if reviewer_prep:
+                        await reviewer_prep
+                    issues = await self.reviewer.areview_chart(complaint_text, current_chart, iteration, on_review_token, self._is_chart_approved)
+                    self._emit_progress("reviewed", iteration, self.max_iterations, "Review complete")
+                except Exception as e:
+                    # Reviewer failed (likely safety filter) - return current chart as final
+                    self.logger.log_warning(f"Reviewer failed: {str(e)}")
+                    self.logger.log_warning("Returning chart without review due to reviewer failure")
+                    self._emit_progress("reviewer_failed", iteration, self.max_iterations, "Reviewer unavailable - returning chart")
+                    
+                    # Store iteration data with error note
+                    history.append(self._iteration_record(iteration, current_chart, f"Reviewer unavailable: {str(e)}"))
+                    return self._finish_run(current_chart, iteration, history, "reviewer_failed")
+                
+                # Store iteration data
+                history.append(self._iteration_record(iteration, current_chart, issues))
+                
+                # Check if chart is approved
+                is_approved = self._is_chart_approved(issues)
+                self.logger.log_iteration_result(iteration, not is_approved, issues)
+                
+                # Step 3: Check if we're done
+                if is_approved:
+                    self._emit_progress("complete", iteration, self.max_iterations, "Chart approved!")
+                    return self._finish_run(current_chart, iteration, history, "approved")
+                
+                # Step 4: Fix the chart if not on last iteration
+                if iteration < self.max_iterations:
+                    self.logger.log_info("Step 3: Fixing chart based on issues...")
+                    self._emit_progress("fixing", iteration, self.max_iterations, "Agent 3: Fixing identified issues...")
+                    try:
+                        if self.fixer in cached_agents:
+                            await (fixer_prep.pop("task", None) or asyncio.to_thread(self.fixer.ensure_context_cache, complaint_text))
+                        current_chart = await self.fixer.afix_chart(complaint_text, current_chart, issues, iteration, self._token_callback(iteration))
+                        self._emit_progress("fixed", iteration, self.max_iterations, "Fixes applied")
+                    except Exception as e:
+                        # Fixer failed - return current chart as final
+                        self.logger.log_warning(f"Fixer failed: {str(e)}")
+                        self.logger.log_warning("Returning chart without fixes due to fixer failure")
+                        self._emit_progress("fixer_failed", iteration, self.max_iterations, "Fixer unavailable - returning chart")
                         
-                        return {
-                            "final_chart": current_chart,
-                            "iterations": iteration,
-                            "history": history,
-                            "status": "fixer_failed",
-                            "log_file": log_file
-                        }
+                        return self._finish_run(current_chart, iteration, history, "fixer_failed")
                 else:
                     self.logger.log_warning("Max iterations reached - returning best effort chart")
                     self._emit_progress("max_iterations", iteration, self.max_iterations, "Max iterations reached")
             
             # Return final chart even if not fully approved
-            self.logger.log_final_result("max_iterations_reached", self.max_iterations, current_chart)
             self._emit_progress("complete", self.max_iterations, self.max_iterations, "Processing complete")
-            log_file = self.logger.end_run()
+            return self._finish_run(current_chart, self.max_iterations, history, "max_iterations_reached")
+            
+        except Exception as e:
+            self._fail_run(e)
+            raise
+        finally:
+            # Let in-flight cache creation (including an unneeded speculative
+            # Fixer cache) land before deleting caches; the worker thread can't
+            # be interrupted, and clearing first would leave its state behind
+            await asyncio.gather(*(
+                task for task in (reviewer_prep, fixer_prep.get("task")) if task
+            ), return_exceptions=True)
+            await asyncio.gather(*(
+                asyncio.to_thread(agent.clear_context_cache)
+                for agent in cached_agents
+            ))
+    
+    def process_complaint_batch(self, complaint_texts: List[str]) -> List[Dict]:
+        """
+        Process several complaints through the Gemini Batch API.
+        
+        Each workflow stage is submitted as one batch job covering every
+        complaint still in progress, so a run takes at most one job per agent
+        per iteration. Jobs are cheaper but can take minutes; use this for
+        non-interactive re-processing, not the UI.
+        
+        Args:
+            complaint_texts: Full text of each legal complaint
             
-            return {
-                "final_chart": current_chart,
-                "iterations": self.max_iterations,
-                "history": history,
-                "status": "max_iterations_reached",
-                "log_file": log_file
+        Returns:
+            One result per complaint, in order, shaped like process_complaint's.
+            All results share the run's log file. A request that fails only
+            fails its own complaint; one whose chart couldn't be generated
+            has status "generator_failed" and an empty final_chart.
+        """
+        self._begin_run()
+        self.logger.log_info(f"Batch run for {len(complaint_texts)} complaints")
+        
+        results: List[Optional[Dict]] = [None] * len(complaint_texts)
+        histories: List[List[Dict]] = [[] for _ in complaint_texts]
+        
+        def finish(index: int, chart: str, iterations: int, status: str):
+            results[index] = {
+                "final_chart": chart,
+                "iterations": iterations,
+                "history": histories[index],
+                "status": status
             }
+        
+        try:
+            self.logger.log_info("Step 1: Generating initial charts...")
+            self._emit_progress("generating", 1, self.max_iterations, "Agent 1: Generating initial falsity charts...")
+            try:
+                charts = self.generator.generate_charts_batch(complaint_texts, 1)
+            except Exception as e:
+                self.logger.log_error(f"Generator failed: {str(e)}")
+                raise  # Generator failure is critical - we can't continue without charts
             
-        except Exception as e:
-            self.logger.log_error(f"Processing failed: {str(e)}")
-            self._emit_progress("error", 0, self.max_iterations, f"Processing failed: {str(e)}")
+            # A complaint whose own request failed has no chart; the rest go on
+            pending = []
+            for i, chart in enumerate(charts):
+                if isinstance(chart, Exception):
+                    self.logger.log_error(f"Generator failed for complaint {i}: {str(chart)}")
+                    finish(i, "", 1, "generator_failed")
+                else:
+                    pending.append(i)
+            
+            for iteration in range(1, self.max_iterations + 1):
+                if not pending:
+                    break
+                self.logger.log_iteration_start(iteration, self.max_iterations)
+                
+                self.logger.log_info(f"Step 2: Reviewing {len(pending)} charts...")
+                self._emit_progress("reviewing", iteration, self.max_iterations, "Agent 2: Reviewing charts for accuracy...")
+                try:
+                    reviews = self.reviewer.review_charts_batch(
+                        [complaint_texts[i] for i in pending], [charts[i] for i in pending], iteration
+                    )
+                except Exception as e:
+                    reviews = [e] * len(pending)
+                
+                # Approval is decided locally; only rejected charts go on
+                rejected = []
+                for i, issues in zip(pending, reviews):
+                    if isinstance(issues, Exception):
+                        self.logger.log_warning(f"Reviewer failed for complaint {i}: {str(issues)}")
+                        histories[i].append(self._iteration_record(iteration, charts[i], f"Reviewer unavailable: {str(issues)}"))
+                        finish(i, charts[i], iteration, "reviewer_failed")
+                        continue
+                    histories[i].append(self._iteration_record(iteration, charts[i], issues))
+                    if self._is_chart_approved(issues):
+                        finish(i, charts[i], iteration, "approved")
+                    else:
+                        rejected.append(i)
+                pending = rejected
+                self.logger.log_info(f"[Iteration {iteration}] {len(pending)} charts need fixes")
+                
+                if not pending or iteration == self.max_iterations:
+                    break
+                
+                self.logger.log_info(f"Step 3: Fixing {len(pending)} charts...")
+                self._emit_progress("fixing", iteration, self.max_iterations, "Agent 3: Fixing identified issues...")
+                try:
+                    fixed = self.fixer.fix_charts_batch(
+                        [complaint_texts[i] for i in pending],
+                        [charts[i] for i in pending],
+                        [histories[i][-1]["issues"] for i in pending],
+                        iteration
+                    )
+                except Exception as e:
+                    fixed = [e] * len(pending)
+                
+                fixed_ok = []
+                for i, chart in zip(pending, fixed):
+                    if isinstance(chart, Exception):
+                        self.logger.log_warning(f"Fixer failed for complaint {i}: {str(chart)}")
+                        finish(i, charts[i], iteration, "fixer_failed")
+                    else:
+                        charts[i] = chart
+                        fixed_ok.append(i)
+                pending = fixed_ok
+            
+            for i in pending:
+                finish(i, charts[i], self.max_iterations, "max_iterations_reached")
+            
+            self.logger.log_info(f"Batch run complete: {sum(r['status'] == 'approved' for r in results)} of {len(results)} charts approved")
+            self._emit_progress("complete", self.max_iterations, self.max_iterations, "Processing complete")
             log_file = self.logger.end_run()
+            
+            for result in results:
+                result["log_file"] = log_file
+            return results
+            
+        except Exception as e:
+            self._fail_run(e)
+            raise
+    
+    def _use_fused(self) -> bool:
+        """Whether to try the single-call FusedAgent workflow first."""
+        return self.fused is not None and not self.batch_mode
+    
+    def _run_fused(self, complaint_text: str) -> Optional[Dict]:
+        """
+        Run the workflow with one FusedAgent call per iteration.
+        
+        Returns:
+            The processing result, or None if a fused response didn't match the
+            schema and the caller should fall back to the separate agents
+        """
+        history = []
+        chart = issues = None
+        try:
+            for iteration in range(1, self.max_iterations + 1):
+                self._check_cancelled()
+                self._start_fused_iteration(iteration)
+                try:
+                    step = self.fused.run(complaint_text, chart, issues, iteration)
+                except FusedResponseError as e:
+                    self.logger.log_warning(f"Fused response unusable, falling back to separate agents: {str(e)}")
+                    return None
+                
+                result = self._record_fused_step(step, iteration, history)
+                if result:
+                    return result
+                chart, issues = step["revised_chart"], step["issues"]
+            
+            return self._fused_result(chart, self.max_iterations, history, "max_iterations_reached")
+        except Exception as e:
+            self._fail_run(e)
             raise
     
+    async def _arun_fused(self, complaint_text: str) -> Optional[Dict]:
+        """Async variant of _run_fused."""
+        history = []
+        chart = issues = None
+        try:
+            for iteration in range(1, self.max_iterations + 1):
+                self._start_fused_iteration(iteration)
+                try:
+                    step = await self.fused.arun(complaint_text, chart, issues, iteration)
+                except FusedResponseError as e:
+                    self.logger.log_warning(f"Fused response unusable, falling back to separate agents: {str(e)}")
+                    return None
+                
+                result = self._record_fused_step(step, iteration, history)
+                if result:
+                    return result
+                chart, issues = step["revised_chart"], step["issues"]
+            
+            return self._fused_result(chart, self.max_iterations, history, "max_iterations_reached")
+        except Exception as e:
+            self._fail_run(e)
+            raise
+    
+    def _start_fused_iteration(self, iteration: int):
+        """Log and report the start of a fused iteration."""
+        self.logger.log_iteration_start(iteration, self.max_iterations)
+        self._emit_progress("iteration_start", iteration, self.max_iterations, f"Starting iteration {iteration}")
+        self.logger.log_info("Generating, reviewing and fixing chart in a single call...")
+        self._emit_progress("generating", iteration, self.max_iterations, "Drafting, reviewing and fixing falsity chart...")
+    
+    def _record_fused_step(self, step: Dict, iteration: int, history: List[Dict]) -> Optional[Dict]:
+        """Add a fused step to the history; returns the final result once approved."""
+        history.append(self._iteration_record(iteration, step["chart"], step["issues"]))
+        
+        # The model's own verdict must agree with the usual approval check
+        is_approved = step["approved"] and self._is_chart_approved(step["issues"])
+        self.logger.log_iteration_result(iteration, not is_approved, step["issues"])
+        if is_approved:
+            return self._fused_result(step["revised_chart"], iteration, history, "approved")
+        return None
+    
+    def _fused_result(self, chart: str, iterations: int, history: List[Dict], status: str) -> Dict:
+        """Finish a fused run and build its result."""
+        self._emit_progress("complete", iterations, self.max_iterations,
+                            "Chart approved!" if status == "approved" else "Processing complete")
+        return self._finish_run(chart, iterations, history, status)
+    
+    def _watch_review_for_issues(self, complaint_text: str, fixer_prep: Dict[str, asyncio.Task],
+                                 forward: Optional[Callable[[str], None]] = None) -> Callable[[str], None]:
+        """
+        Build an on_token callback for a streaming review that starts preparing
+        the Fixer's context cache as soon as a failing row appears, overlapping
+        that round-trip with the rest of the review. Chunks are also passed on
+        to forward, if given.
+        """
+        recent: List[str] = []
+        
+        def on_token(text: str):
+            if forward:
+                forward(text)
+            if "task" in fixer_prep:
+                return
+            recent.append(text.lower())
+            # Markers may straddle a chunk boundary
+            window = "".join(recent[-2:])
+            if any(marker in window for marker in ISSUE_MARKERS):
+                fixer_prep["task"] = asyncio.create_task(
+                    asyncio.to_thread(self.fixer.ensure_context_cache, complaint_text)
+                )
+        
+        return on_token
+    
+    def _context_cached_agents(self, complaint_text: str) -> tuple:
+        """Agents that receive the full complaint on every iteration, if it's worth caching."""
+        if not config.CONTEXT_CACHE_ENABLED or self.batch_mode:
+            return ()
+        # Gemini rejects caches below a minimum size; skip the doomed round trips
+        if estimate_tokens(complaint_text) < config.CONTEXT_CACHE_MIN_TOKENS:
+            return ()
+        return (self.reviewer, self.fixer)
+    
     def _is_chart_approved(self, issues: str) -> bool:
         """
         Check if the chart is approved (no issues found).
@@ -186,58 +664,96 @@ class Orchestrator:
         Returns:
             True if approved, False otherwise
         """
-        issues_lower = issues.lower()
-        
-        # Check for approval indicators - phrases that indicate the chart is good
-        approval_phrases = [
-            "no issues",
-            "no discrepancies",
-            "all correct",
-            "chart is correct",
-            "passes all checks",
-            "no errors found",
-            "highly accurate",
-            "is accurate",
-            "all pass",
-            "no hallucinations",
-            "no errors",
-            "verified that every entry is accurate"
-        ]
-        
-        # Check for rejection indicators - phrases that indicate problems
-        rejection_phrases = [
-            "fail",
-            "error:",
-            "hallucination:",
-            "citation error",
-            "quote error",
-            "attribution error",
-            "warning:",
-            "needs correction",
-            "incorrect",
-            "mismatch"
-        ]
-        
-        # If any rejection phrase is found (not in a "no X" context), reject
-        for phrase in rejection_phrases:
-            if phrase in issues_lower:
-                # Check if it's negated (e.g., "no hallucination")
-                negation_check = f"no {phrase}"
-                if negation_check not in issues_lower:
-                    # Check for "| **Pass** |" pattern - if all rows pass, it's approved
-                    pass_count = issues_lower.count("| **pass**")
-                    fail_count = issues_lower.count("| **fail**")
-                    warning_count = issues_lower.count("| **warning**")
-                    
-                    if fail_count > 0 or warning_count > 0:
-                        return False
+        # Reviews often repeat verbatim once the chart converges
+        key = hashlib.blake2b(issues.encode("utf-8"), digest_size=16).digest()
+        approved = self._approval_memo.get(key)
+        if approved is None:
+            approved = self._approval_memo[key] = self._parse_approval(issues)
+        return approved
+    
+    def _parse_approval(self, issues: str) -> bool:
+        """Decide approval from the review's row statuses and phrasing."""
+        statuses = Counter(match.group(1).lower() for match in _STATUS_RE.finditer(issues))
+        has_problems = statuses["fail"] > 0 or statuses["warning"] > 0
         
         # Check if all rows are marked as Pass
-        if "| **pass**" in issues_lower:
-            fail_count = issues_lower.count("| **fail**")
-            warning_count = issues_lower.count("| **warning**")
-            if fail_count == 0 and warning_count == 0:
-                return True
+        if statuses["pass"] > 0 and not has_problems:
+            return True
+        
+        has_approval = False
+        rejections = set()
+        negated = set()
+        for match in _PHRASE_RE.finditer(issues):
+            if match.lastgroup == "approval":
+                # Without failing or warning rows, rejection phrases don't matter
+                if not has_problems:
+                    return True
+                has_approval = True
+            elif has_problems:
+                # A phrase counts as negated if any of its occurrences is, so
+                # only the match and the few characters before it are lowercased
+                start, end = match.span("rejection")
+                phrase = issues[start:end].lower()
+                rejections.add(phrase)
+                if issues[max(start - len(NEGATION_PREFIX), 0):end].lower() in _NEGATION_SET:
+                    negated.add(phrase)
+        
+        # If any rejection phrase is found (not in a "no X" context) and some
+        # rows fail or warn, reject
+        if rejections - negated:
+            return False
         
         # Check for approval phrases
-        return any(phrase in issues_lower for phrase in approval_phrases)
\ No newline at end of file
+        return has_approval
+
+# Idle orchestrators; agents (models, prompts) are reused across requests
+_ORCH_POOL: "queue.SimpleQueue[Orchestrator]" = queue.SimpleQueue()
+
+def acquire_orchestrator(progress_callback: Optional[Callable[[str, int, int, str], None]] = None,
+                         batch_mode: bool = False) -> Orchestrator:
+    """Take an idle orchestrator from the pool (or build one) and reset it for a new request."""
+    try:
+        orchestrator = _ORCH_POOL.get_nowait()
+    except queue.Empty:
+        return Orchestrator(progress_callback=progress_callback, batch_mode=batch_mode)
+    orchestrator.reset(progress_callback=progress_callback, batch_mode=batch_mode)
+    return orchestrator
+
+def release_orchestrator(orchestrator: Orchestrator):
+    """Return an orchestrator to the pool once its run has fully finished."""
+    orchestrator.progress_callback = None
+    _ORCH_POOL.put(orchestrator)
+
+@asynccontextmanager
+async def borrow_orchestrator(progress_callback: Optional[Callable[[str, int, int, str], None]] = None,
+                              batch_mode: bool = False) -> AsyncGenerator[Orchestrator, None]:
+    """Use a pooled orchestrator for the duration of an async block."""
+    orchestrator = acquire_orchestrator(progress_callback=progress_callback, batch_mode=batch_mode)
+    try:
+        yield orchestrator
+    finally:
+        release_orchestrator(orchestrator)
+
+async def process_complaints_async(complaint_texts: List[str], concurrency: int = 10) -> List[Union[Dict, Exception]]:
+    """
+    Process several complaints concurrently on the event loop.
+    
+    Each complaint runs on its own pooled orchestrator, so runs get separate
+    RunLoggers and context caches; at most `concurrency` run at once.
+    
+    Args:
+        complaint_texts: Full text of each legal complaint
+        concurrency: Maximum number of complaints in flight
+        
+    Returns:
+        One aprocess_complaint result per complaint, in input order, or the
+        exception that complaint's run raised
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def process(complaint_text: str) -> Dict:
+        async with semaphore:
+            async with borrow_orchestrator() as orchestrator:
+                return await orchestrator.aprocess_complaint(complaint_text)
+    
+    return await asyncio.gather(*(process(text) for text in complaint_texts), return_exceptions=True)
\ No newline at end of file
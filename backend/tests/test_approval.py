@@ -0,0 +1,160 @@
+"""
+Approval parsing tests.
+
+Orchestrator._is_chart_approved has been rewritten for speed several times;
+it must keep deciding exactly as the original implementation below does.
+
+Run from backend/: python -m unittest discover tests
+"""
+import random
+import unittest
+
+from orchestrator import APPROVAL_PHRASES, REJECTION_PHRASES, Orchestrator
+
+def reference_is_chart_approved(issues: str) -> bool:
+    """The original _is_chart_approved, frozen as the behavior to preserve."""
+    issues_lower = issues.lower()
+    
+    # Check for approval indicators - phrases that indicate the chart is good
+    approval_phrases = [
+        "no issues",
+        "no discrepancies",
+        "all correct",
+        "chart is correct",
+        "passes all checks",
+        "no errors found",
+        "highly accurate",
+        "is accurate",
+        "all pass",
+        "no hallucinations",
+        "no errors",
+        "verified that every entry is accurate"
+    ]
+    
+    # Check for rejection indicators - phrases that indicate problems
+    rejection_phrases = [
+        "fail",
+        "error:",
+        "hallucination:",
+        "citation error",
+        "quote error",
+        "attribution error",
+        "warning:",
+        "needs correction",
+        "incorrect",
+        "mismatch"
+    ]
+    
+    # If any rejection phrase is found (not in a "no X" context), reject
+    for phrase in rejection_phrases:
+        if phrase in issues_lower:
+            # Check if it's negated (e.g., "no hallucination")
+            negation_check = f"no {phrase}"
+            if negation_check not in issues_lower:
+                fail_count = issues_lower.count("| **fail**")
+                warning_count = issues_lower.count("| **warning**")
+                
+                if fail_count > 0 or warning_count > 0:
+                    return False
+    
+    # Check if all rows are marked as Pass
+    if "| **pass**" in issues_lower:
+        fail_count = issues_lower.count("| **fail**")
+        warning_count = issues_lower.count("| **warning**")
+        if fail_count == 0 and warning_count == 0:
+            return True
+    
+    # Check for approval phrases
+    return any(phrase in issues_lower for phrase in approval_phrases)
+
+# Pieces of reviewer output that exercise every branch: status cells, every
+# phrase in both groups, negations, mixed case and overlapping phrases
+FRAGMENTS = [
+    "| **Pass** |", "| **FAIL** |", "| **warning** |", "| **pass**",
+    "no issues", "No Discrepancies", "ALL CORRECT", "chart is correct", "passes all checks",
+    "no errors found", "no errors", "highly accurate", "is accurate", "All pass",
+    "no hallucinations", "verified that every entry is accurate",
+    "fail", "no fail", "NO FAIL", "Error:", "no error:", "hallucination:", "nO hallucination:",
+    "citation error", "citation error:", "no citation error", "quote error", "attribution error",
+    "warning:", "No Warning:", "needs correction", "no needs correction",
+    "incorrect", "No Incorrect", "mismatch", "No Mismatch",
+    "x ", "xno ", "no ", "\n", " ", "|",
+]
+
+class ApprovalTest(unittest.TestCase):
+    """Orchestrator approval decisions against the reference implementation."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.orchestrator = Orchestrator()
+    
+    def setUp(self):
+        self.orchestrator.reset()
+    
+    def assertMatchesReference(self, issues: str, expected: bool):
+        self.assertIs(reference_is_chart_approved(issues), expected, "reference disagrees with expected")
+        self.assertIs(self.orchestrator._is_chart_approved(issues), expected)
+        # Again, through the memo
+        self.assertIs(self.orchestrator._is_chart_approved(issues), expected)
+    
+    def test_all_pass_table(self):
+        table = (
+            "| # | Check | Status |\n"
+            "|---|---|---|\n"
+            "| 1 | Citation | **Pass** |\n"
+            "| 2 | Quote | **Pass** |"
+        )
+        self.assertMatchesReference(table, True)
+        self.assertMatchesReference("| 1 | **Pass** |\n| 2 | **Pass** |", True)
+    
+    def test_failing_row_rejects(self):
+        self.assertMatchesReference("| 1 | **Pass** |\n| 2 | **Fail** | quote mismatch", False)
+        self.assertMatchesReference("| 1 | **Warning** | date off", False)
+    
+    def test_negated_rejection(self):
+        # "no fail" negates every occurrence of "fail", including the row status
+        self.assertMatchesReference("No issues. There was no fail.\n| 1 | **Fail** |", True)
+        self.assertMatchesReference("no hallucination: all correct\n| 1 | **Warning** |", True)
+        self.assertMatchesReference("no fail", False)
+    
+    def test_mixed_case(self):
+        self.assertMatchesReference("NO ISSUES FOUND", True)
+        self.assertMatchesReference("| 1 | **PASS** |", True)
+        self.assertMatchesReference("All Correct, but | **FAIL** | Citation Error here", False)
+        self.assertMatchesReference("ALL CORRECT\n| 1 | **fail** | NO FAIL", True)
+    
+    def test_overlapping_phrases(self):
+        # "citation error:" contains both "citation error" and "error:"
+        self.assertMatchesReference("no issues\n| 1 | **Warning** | citation error: para 12", False)
+        self.assertMatchesReference("no issues\n| 1 | **Warning** | no citation error: para 12", False)
+        self.assertMatchesReference("no issues\n| 1 | **Warning** | no citation error no error:", True)
+        self.assertMatchesReference("no errors found", True)
+    
+    def test_no_verdict(self):
+        self.assertMatchesReference("", False)
+        self.assertMatchesReference("The chart has several problems.", False)
+    
+    def test_phrases_fit_single_pass(self):
+        # _PHRASE_RE records one phrase per position; see the comment above it
+        approvals = [phrase.lower() for phrase in APPROVAL_PHRASES]
+        rejections = [phrase.lower() for phrase in REJECTION_PHRASES]
+        for approval in approvals:
+            for rejection in rejections:
+                self.assertFalse(approval.startswith(rejection) or rejection.startswith(approval), (approval, rejection))
+        for group in (approvals, rejections):
+            for index, phrase in enumerate(group):
+                for later in group[index + 1:]:
+                    self.assertFalse(later.startswith(phrase), f"list {later!r} before {phrase!r}")
+        for phrase in rejections:
+            for other in rejections:
+                self.assertFalse(phrase != other and other.startswith(phrase), (phrase, other))
+    
+    def test_random_reviews_match_reference(self):
+        rng = random.Random(1)
+        for _ in range(50000):
+            issues = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 10)))
+            with self.subTest(issues=issues):
+                self.assertIs(self.orchestrator._parse_approval(issues), reference_is_chart_approved(issues))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,28 @@
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from typing import Optional
-import uuid
+
+class LineBufferedFileHandler(logging.FileHandler):
+    """
+    File handler whose stream is line-buffered, so each record reaches the file
+    as soon as it is written. Records are written by the run's QueueListener
+    thread, so these writes stay off the request path.
+    """
+    
+    def __init__(self, filename: str):
+        super().__init__(filename, encoding='utf-8')
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=1,
+                    encoding=self.encoding, errors=self.errors)
+
+def _preview(text: str, max_length: int) -> str:
+    """Truncate text to max_length characters, marking the cut."""
+    return text[:max_length] + "..." if len(text) > max_length else text
 
 class RunLogger:
     """Logger that creates a unique log file for each processing run."""
@@ -11,17 +30,21 @@ class RunLogger:
     def __init__(self, logs_dir: str = "logs"):
         self.logs_dir = logs_dir
         self.run_id: Optional[str] = None
+        self.started_at: Optional[datetime] = None
         self.log_file: Optional[str] = None
         self.logger: Optional[logging.Logger] = None
-        self.file_handler: Optional[logging.FileHandler] = None
+        self.file_handler: Optional[LineBufferedFileHandler] = None
         self.console_handler: Optional[logging.StreamHandler] = None
+        self.queue_handler: Optional[QueueHandler] = None
+        self.listener: Optional[QueueListener] = None
         
         # Ensure logs directory exists
         os.makedirs(logs_dir, exist_ok=True)
     
     def start_run(self) -> str:
         """Start a new logging run with a unique ID."""
-        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + str(uuid.uuid4())[:8]
+        self.started_at = datetime.now()
+        self.run_id = f"{self.started_at:%Y%m%d_%H%M%S}_{os.urandom(4).hex()}"
         self.log_file = os.path.join(self.logs_dir, f"run_{self.run_id}.log")
         
         # Create a new logger for this run
@@ -32,9 +55,11 @@ class RunLogger:
         # Remove any existing handlers
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
+        if self.listener:
+            self.listener.stop()
         
         # Create file handler
-        self.file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        self.file_handler = LineBufferedFileHandler(self.log_file)
         self.file_handler.setLevel(logging.DEBUG)
         
         # Create console handler - use sys.stdout for better compatibility with uvicorn
@@ -49,9 +74,18 @@ class RunLogger:
         self.file_handler.setFormatter(formatter)
         self.console_handler.setFormatter(formatter)
         
-        # Add handlers
-        self.logger.addHandler(self.file_handler)
-        self.logger.addHandler(self.console_handler)
+        # Records are queued by the caller and written by a background thread,
+        # so logging never blocks the request path on file or console I/O
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.queue_handler = QueueHandler(log_queue)
+        self.logger.addHandler(self.queue_handler)
+        self.listener = QueueListener(
+            log_queue,
+            self.file_handler,
+            self.console_handler,
+            respect_handler_level=True
+        )
+        self.listener.start()
         
         self._log_header()
         return self.run_id
@@ -61,71 +95,60 @@ class RunLogger:
         if self.logger:
             self.logger.info("=" * 80)
             self.logger.info("FALSITY CHART GENERATOR - NEW RUN")
-            self.logger.info(f"Run ID: {self.run_id}")
-            self.logger.info(f"Started at: {datetime.now().isoformat()}")
+            self.logger.info("Run ID: %s", self.run_id)
+            self.logger.info("Started at: %s", self.started_at.isoformat())
             self.logger.info("=" * 80)
-            self._flush()
     
     def log_agent_start(self, agent_name: str, iteration: int = 1):
         """Log when an agent starts processing."""
         if self.logger:
             self.logger.info("-" * 60)
-            self.logger.info(f"AGENT: {agent_name} | Iteration: {iteration}")
+            self.logger.info("AGENT: %s | Iteration: %d", agent_name, iteration)
             self.logger.info("-" * 60)
-            self._flush()
     
     def log_agent_input(self, agent_name: str, input_preview: str, max_length: int = 500):
         """Log the input being sent to an agent."""
-        if self.logger:
-            preview = input_preview[:max_length] + "..." if len(input_preview) > max_length else input_preview
-            self.logger.debug(f"[{agent_name}] INPUT PREVIEW:")
-            self.logger.debug(preview)
-            self._flush()
+        # Inputs carry the whole complaint; skip the slicing unless DEBUG is on
+        if self.logger and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("[%s] INPUT PREVIEW:\n%s", agent_name, _preview(input_preview, max_length))
     
     def log_agent_output(self, agent_name: str, output: str, max_length: int = 1000):
         """Log the output from an agent."""
         if self.logger:
-            preview = output[:max_length] + "..." if len(output) > max_length else output
-            self.logger.info(f"[{agent_name}] OUTPUT PREVIEW:")
-            self.logger.info(preview)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("[%s] OUTPUT PREVIEW:\n%s", agent_name, _preview(output, max_length))
             
             # Log full output to file only
-            self.logger.debug(f"[{agent_name}] FULL OUTPUT:")
-            self.logger.debug(output)
-            self._flush()
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("[%s] FULL OUTPUT:\n%s", agent_name, output)
     
     def log_agent_complete(self, agent_name: str, duration_seconds: float):
         """Log when an agent completes processing."""
         if self.logger:
-            self.logger.info(f"[{agent_name}] COMPLETED in {duration_seconds:.2f} seconds")
-            self._flush()
+            self.logger.info("[%s] COMPLETED in %.2f seconds", agent_name, duration_seconds)
     
     def log_agent_error(self, agent_name: str, error: str):
         """Log an error from an agent."""
         if self.logger:
-            self.logger.error(f"[{agent_name}] ERROR: {error}")
-            self._flush()
+            self.logger.error("[%s] ERROR: %s", agent_name, error)
     
     def log_iteration_start(self, iteration: int, max_iterations: int):
         """Log the start of an iteration."""
         if self.logger:
             self.logger.info("")
             self.logger.info("=" * 60)
-            self.logger.info(f"ITERATION {iteration} of {max_iterations}")
+            self.logger.info("ITERATION %d of %d", iteration, max_iterations)
             self.logger.info("=" * 60)
-            self._flush()
     
     def log_iteration_result(self, iteration: int, has_issues: bool, issues_preview: str = ""):
         """Log the result of an iteration."""
         if self.logger:
             if has_issues:
-                self.logger.info(f"[Iteration {iteration}] Issues found - will attempt fix")
-                if issues_preview:
-                    preview = issues_preview[:300] + "..." if len(issues_preview) > 300 else issues_preview
-                    self.logger.info(f"Issues preview: {preview}")
+                self.logger.info("[Iteration %d] Issues found - will attempt fix", iteration)
+                if issues_preview and self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("Issues preview: %s", _preview(issues_preview, 300))
             else:
-                self.logger.info(f"[Iteration {iteration}] No issues found - chart approved!")
-            self._flush()
+                self.logger.info("[Iteration %d] No issues found - chart approved!", iteration)
     
     def log_final_result(self, status: str, total_iterations: int, chart_preview: str = ""):
         """Log the final result of the processing."""
@@ -133,60 +156,53 @@ class RunLogger:
             self.logger.info("")
             self.logger.info("=" * 80)
             self.logger.info("PROCESSING COMPLETE")
-            self.logger.info(f"Status: {status}")
-            self.logger.info(f"Total iterations: {total_iterations}")
-            self.logger.info(f"Log file: {self.log_file}")
+            self.logger.info("Status: %s", status)
+            self.logger.info("Total iterations: %d", total_iterations)
+            self.logger.info("Log file: %s", self.log_file)
             self.logger.info("=" * 80)
             
-            if chart_preview:
-                preview = chart_preview[:500] + "..." if len(chart_preview) > 500 else chart_preview
-                self.logger.info("Final chart preview:")
-                self.logger.info(preview)
-            self._flush()
-    
-    def log_info(self, message: str):
-        """Log an info message."""
-        if self.logger:
-            self.logger.info(message)
-            self._flush()
+            if chart_preview and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Final chart preview:\n%s", _preview(chart_preview, 500))
     
-    def log_debug(self, message: str):
-        """Log a debug message."""
+    def log_info(self, message: str, *args):
+        """Log an info message, %-formatted with args only if it is emitted."""
         if self.logger:
-            self.logger.debug(message)
-            self._flush()
+            self.logger.info(message, *args)
     
-    def log_warning(self, message: str):
-        """Log a warning message."""
+    def log_debug(self, message: str, *args):
+        """Log a debug message, %-formatted with args only if it is emitted."""
         if self.logger:
-            self.logger.warning(message)
-            self._flush()
+            self.logger.debug(message, *args)
     
-    def log_error(self, message: str):
-        """Log an error message."""
+    def log_warning(self, message: str, *args):
+        """Log a warning message, %-formatted with args only if it is emitted."""
         if self.logger:
-            self.logger.error(message)
-            self._flush()
+            self.logger.warning(message, *args)
     
-    def _flush(self):
-        """Flush all handlers to ensure output is visible immediately."""
-        if self.file_handler:
-            self.file_handler.flush()
-        if self.console_handler:
-            self.console_handler.flush()
+    def log_error(self, message: str, *args):
+        """Log an error message, %-formatted with args only if it is emitted."""
+        if self.logger:
+            self.logger.error(message, *args)
     
     def end_run(self):
         """End the current run and close handlers."""
         if self.logger:
-            self.logger.info(f"Run ended at: {datetime.now().isoformat()}")
+            self.logger.info("Run ended at: %s", datetime.now().isoformat())
+            
+            # Stopping the listener writes out everything still queued
+            if self.listener:
+                self.listener.stop()
+                self.listener = None
+            
+            if self.queue_handler:
+                self.logger.removeHandler(self.queue_handler)
+                self.queue_handler = None
             
             if self.file_handler:
                 self.file_handler.close()
-                self.logger.removeHandler(self.file_handler)
             
             if self.console_handler:
                 self.console_handler.close()
-                self.logger.removeHandler(self.console_handler)
         
         return self.log_file
     
@@ -1,5 +1,18 @@
-import PyPDF2
-from typing import Optional
+import pypdfium2 as pdfium
+import re
+import threading
+from typing import List, Optional
+
+# PDFium is not thread-safe, even across separate documents, so every call
+# into it in this process goes through this lock. Processes that extract
+# PDFs must be spawned rather than forked, or they may inherit it held.
+_PDFIUM_LOCK = threading.Lock()
+
+# Common legal complaint indicators; they appear on a complaint's first pages
+_INDICATOR_RE = re.compile(r"complaint|plaintiff|defendant|paragraph", re.IGNORECASE)
+
+# Only this much of the text is scanned for indicators
+VALIDATION_SCAN_CHARS = 64 * 1024
 
 def extract_text_from_pdf(pdf_file) -> str:
     """
@@ -11,17 +24,64 @@ def extract_text_from_pdf(pdf_file) -> str:
     Returns:
         Extracted text as string
     """
+    return join_pages(extract_page_range(pdf_file, 0, None))
+
+def count_pages(pdf_file) -> int:
+    """Return the number of pages in a PDF."""
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(pdf_file)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+    except Exception as e:
+        raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+def extract_page_range(pdf_file, start: int, stop: Optional[int]) -> List[str]:
+    """
+    Extract the text of pages start to stop (exclusive) of a PDF.
+    
+    Runs in worker processes for large PDFs, so pdf_file may be the raw bytes.
+    Threads in one process extract one document at a time.
+    
+    Args:
+        pdf_file: File object, path or bytes of the PDF
+        start: Index of the first page
+        stop: Index after the last page, or None for the end of the document
         
-        return text.strip()
+    Returns:
+        Text of each page, in order
+    """
+    try:
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(pdf_file)
+            try:
+                stop = len(pdf) if stop is None else min(stop, len(pdf))
+                return [_page_text(pdf, index) for index in range(start, stop)]
+            finally:
+                pdf.close()
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
+def join_pages(pages: List[str]) -> str:
+    """Combine extracted page texts into the document text."""
+    # Join once at the end; repeated += copies the growing text per page.
+    # PDFium ends lines with \r\n.
+    return "\n".join(pages).replace("\r\n", "\n").strip()
+
+def _page_text(pdf: pdfium.PdfDocument, index: int) -> str:
+    """Extract one page's text, releasing its native resources straight away (hold _PDFIUM_LOCK)."""
+    page = pdf[index]
+    try:
+        textpage = page.get_textpage()
+        try:
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+
 def validate_complaint_text(text: str) -> bool:
     """
     Basic validation to ensure the extracted text is not empty
@@ -36,8 +96,5 @@ def validate_complaint_text(text: str) -> bool:
     if not text or len(text.strip()) < 100:
         return False
     
-    # Check for common legal complaint indicators
-    indicators = ["complaint", "plaintiff", "defendant", "paragraph"]
-    text_lower = text.lower()
-    
-    return any(indicator in text_lower for indicator in indicators)
\ No newline at end of file
+    # Check for common legal complaint indicators near the start of the text
+    return _INDICATOR_RE.search(text, 0, VALIDATION_SCAN_CHARS) is not None
\ No newline at end of file
@@ -0,0 +1,99 @@
+import re
+from typing import List
+
+class MissingBlocksError(Exception):
+    """Raised when a model response leaves out some of the requested tagged blocks."""
+
+def split_sections(text: str, count: int) -> List[str]:
+    """
+    Split text into roughly equal sections on line boundaries.
+    
+    Args:
+        text: Text to split
+        count: Desired number of sections
+        
+    Returns:
+        List of non-empty sections (may be fewer than count for short text)
+    """
+    lines = text.splitlines(keepends=True)
+    if count <= 1 or len(lines) <= 1:
+        return [text]
+    
+    target = len(text) / count
+    sections = []
+    current: List[str] = []
+    current_len = 0
+    
+    for line in lines:
+        current.append(line)
+        current_len += len(line)
+        # Close the section at a line boundary once it reaches its share
+        if current_len >= target and len(sections) < count - 1:
+            sections.append("".join(current))
+            current = []
+            current_len = 0
+    
+    if current:
+        sections.append("".join(current))
+    
+    return [section for section in sections if section.strip()]
+
+def build_sectioned_input(sections: List[str]) -> str:
+    """Concatenate sections under indexed "### SECTION k" headers."""
+    return "\n\n".join(
+        f"### SECTION {index}\n{section.strip()}"
+        for index, section in enumerate(sections, start=1)
+    )
+
+def parse_tagged_blocks(response: str, tag: str, count: int) -> List[str]:
+    """
+    Parse <TAG k>...</TAG k> blocks from a model response.
+    
+    Args:
+        response: Raw model response
+        tag: Tag name (e.g. "CHART")
+        count: Expected number of blocks
+        
+    Returns:
+        List of block contents ordered by index
+        
+    Raises:
+        MissingBlocksError: If any of the count blocks is absent
+    """
+    pattern = re.compile(rf"<{tag}\s+(\d+)>(.*?)</{tag}\s+\1>", re.DOTALL)
+    blocks = {int(index): body.strip() for index, body in pattern.findall(response)}
+    
+    missing = [index for index in range(1, count + 1) if index not in blocks]
+    if missing:
+        raise MissingBlocksError(f"Response missing {tag} blocks: {missing}")
+    
+    return [blocks[index] for index in range(1, count + 1)]
+
+def merge_markdown_tables(charts: List[str]) -> str:
+    """
+    Merge markdown tables into one, keeping the first header row.
+    
+    Args:
+        charts: Markdown charts sharing the same columns
+        
+    Returns:
+        Single markdown table
+    """
+    if len(charts) == 1:
+        return charts[0]
+    
+    header: List[str] = []
+    rows: List[str] = []
+    
+    for chart in charts:
+        table_lines = [line.strip() for line in chart.splitlines() if line.strip().startswith("|")]
+        if len(table_lines) < 2:
+            continue
+        if not header:
+            header = table_lines[:2]
+        rows.extend(table_lines[2:])
+    
+    if not header:
+        return "\n\n".join(chart.strip() for chart in charts)
+    
+    return "\n".join(header + rows)
\ No newline at end of file
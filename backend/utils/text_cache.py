@@ -0,0 +1,37 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+class TextCache:
+    """LRU cache of extracted text, bounded by entry count and total characters."""
+    
+    def __init__(self, max_entries: int = 128, max_chars: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._total_chars = 0
+    
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached text for key (marking it recently used), or None."""
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+        return text
+    
+    def put(self, key: Hashable, text: str):
+        """Store text under key, evicting least recently used entries as needed."""
+        if len(text) > self.max_chars:
+            return
+        
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_chars -= len(previous)
+        
+        self._entries[key] = text
+        self._total_chars += len(text)
+        
+        while len(self._entries) > self.max_entries or self._total_chars > self.max_chars:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_chars -= len(evicted)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
\ No newline at end of file
@@ -16,11 +16,12 @@ export interface ProcessingResult {
 }
 
 export interface ProgressUpdate {
-  type: 'progress' | 'complete' | 'error';
+  type: 'progress' | 'token' | 'complete' | 'error';
   step?: string;
   iteration?: number;
   max_iterations?: number;
   message?: string;
+  text?: string; // Streamed agent output chunk (type === 'token')
   result?: ProcessingResult;
 }
 